@@ -1,10 +1,46 @@
 #!/usr/bin/env python3
-from flask import Flask, request, render_template_string
+from flask import Flask, make_response, request
+import functools
+import gzip
 import subprocess
+import tempfile
 import os
+import re
+import zlib
 
 app = Flask(__name__)
-CONFIG_FILE = "/etc/pi_camera_capture.conf"
+# Lives in its own directory so only /etc/picam, never /etc, needs to be
+# group-writable for the atomic replace in save_config
+CONFIG_FILE = "/etc/picam/pi_camera_capture.conf"
+
+# Config keys editable from the form, paired with their form field names;
+# anything else posted is ignored rather than written to CONFIG_FILE
+ALLOWED_KEYS = ('WIDTH', 'HEIGHT', 'FPS', 'BITRATE', 'SHUTTER', 'GAIN', 'AWBGAINS', 'LENS_SHADING_FILE')
+_FORM_FIELDS = tuple((key, key.lower()) for key in ALLOWED_KEYS)
+
+# Parsed config cache: 'entry' holds one (signature, config) tuple, with the
+# signature being (st_mtime_ns, st_size) of CONFIG_FILE. Swapping the whole
+# tuple keeps gthread workers from pairing a new signature with old data.
+_CFG_CACHE = {'entry': None}
+# KEY=VALUE lines, ignoring comments and surrounding whitespace
+_CFG_RE = re.compile(r'(?m)^[ \t]*([^#=\s][^=\n]*?)[ \t]*=[ \t]*(.*?)[ \t]*$')
+
+# Hls.js is only ever served from the app's static folder (vendored and
+# integrity-checked by fetch_hls_js.sh), never from a third-party CDN. Without
+# it the page falls back to the browser's native HLS support.
+HLS_JS_VERSION = "1.5.17"
+HLS_JS_FILE = f"hls-{HLS_JS_VERSION}.min.js"
+if os.path.exists(os.path.join(app.static_folder, HLS_JS_FILE)):
+    HLS_JS_SRC = f"/static/{HLS_JS_FILE}"
+else:
+    HLS_JS_SRC = ''
+    app.logger.warning('%s not found in %s; run fetch_hls_js.sh to vendor it, '
+                       'streaming needs native HLS until then', HLS_JS_FILE, app.static_folder)
+
+# Same-origin stream path to use when a reverse proxy maps it to the HLS server
+# (nginx: location /camera/ { proxy_pass http://127.0.0.1:8889/camera/; }).
+# Unset, the page loads the stream directly from port 8889.
+STREAM_URL = os.environ.get('PICAM_STREAM_URL', '')
 
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -59,44 +95,43 @@ HTML_TEMPLATE = """
         </div>
     </div>
     
-    <script src="https://cdn.jsdelivr.net/npm/hls.js@latest"></script>
+    {% if hls_js_src %}<script src="{{ hls_js_src }}"></script>{% endif %}
     <script>
+        // STREAM_URL is set when a front-end proxy serves the stream from the
+        // page's own origin (e.g. '/camera/index.m3u8'); otherwise fetch it
+        // straight from the HLS server on port 8889 of the same host.
+        const STREAM_URL = {{ stream_url|tojson }};
         function getStreamURL() {
-            const host = window.location.hostname;
-            const port = window.location.port ? window.location.port : '8889';
-            return `http://${host}:${port}/camera/index.m3u8`;
+            if (STREAM_URL) {
+                return STREAM_URL;
+            }
+            return `${window.location.protocol}//${window.location.hostname}:8889/camera/index.m3u8`;
         }
 
-        // Check playlist availability before trying to attach player
-        async function checkPlaylist(url) {
-            try {
-                const res = await fetch(url, { method: 'GET', cache: 'no-store' });
-                return res.ok;
-            } catch (e) {
-                return false;
-            }
+        // Exponential backoff between stream retries, reset once playback starts
+        const MIN_RETRY_DELAY_MS = 1000;
+        const MAX_RETRY_DELAY_MS = 60000;
+        let retryDelayMs = MIN_RETRY_DELAY_MS;
+        function scheduleRetry(status) {
+            status.textContent = `No stream available right now. Retrying in ${Math.round(retryDelayMs / 1000)}s...`;
+            setTimeout(loadStream, retryDelayMs);
+            retryDelayMs = Math.min(retryDelayMs * 1.5, MAX_RETRY_DELAY_MS);
         }
 
         let hlsInstance = null;
-        async function loadStream() {
+        function loadStream() {
             const video = document.getElementById('video');
             const status = document.getElementById('streamStatus');
             const streamUrl = getStreamURL();
 
-            status.textContent = 'Checking stream...';
-            const available = await checkPlaylist(streamUrl);
-            if (!available) {
-                status.textContent = 'No stream available right now. Retrying in 5s...';
-                // clear any existing src/hls
-                if (hlsInstance) { try { hlsInstance.destroy(); } catch(e){} hlsInstance = null; }
-                video.removeAttribute('src');
-                setTimeout(loadStream, 5000);
-                return;
-            }
-
-            status.textContent = 'Stream found — starting playback';
+            status.textContent = 'Connecting to stream...';
 
             if (video.canPlayType('application/vnd.apple.mpegurl')) {
+                video.onerror = function () {
+                    video.removeAttribute('src');
+                    scheduleRetry(status);
+                };
+                video.onloadedmetadata = function () { retryDelayMs = MIN_RETRY_DELAY_MS; };
                 video.src = streamUrl;
                 video.play().catch(()=>{});
                 status.textContent = '';
@@ -106,20 +141,24 @@ HTML_TEMPLATE = """
                         hlsInstance.destroy();
                         hlsInstance = null;
                     }
-                    hlsInstance = new Hls({ maxBufferLength: 30 });
+                    // Low-latency live: small forward/back buffers and sync two segments from the edge
+                    hlsInstance = new Hls({ lowLatencyMode: true, backBufferLength: 4, maxBufferLength: 6, liveSyncDurationCount: 2 });
                     hlsInstance.on(Hls.Events.ERROR, function (event, data) {
                         console.error('Hls error', event, data);
-                        status.textContent = 'Playback error. Retrying in 5s...';
-                        setTimeout(loadStream, 5000);
+                        // Hls.js retries non-fatal errors itself; only rebuild the player on fatal ones
+                        if (!data.fatal) return;
+                        hlsInstance.destroy();
+                        hlsInstance = null;
+                        scheduleRetry(status);
                     });
                     hlsInstance.loadSource(streamUrl);
                     hlsInstance.attachMedia(video);
-                    hlsInstance.on(Hls.Events.MANIFEST_PARSED, function() { video.play().catch(()=>{}); status.textContent = ''; });
+                    hlsInstance.on(Hls.Events.MANIFEST_PARSED, function() { retryDelayMs = MIN_RETRY_DELAY_MS; video.play().catch(()=>{}); status.textContent = ''; });
                 } catch (e) {
                     status.textContent = 'Failed to play stream: ' + e.message;
                 }
             } else {
-                status.textContent = 'HLS not supported in this browser. Try Safari or install Hls.js.';
+                status.textContent = 'HLS not supported in this browser. Try Safari, or vendor Hls.js with fetch_hls_js.sh.';
             }
         }
 
@@ -141,34 +180,71 @@ HTML_TEMPLATE = """
 </html>
 """
 
+def _minify(html):
+    # Drop indentation and blank lines; newlines are kept so inline JS still parses
+    return '\n'.join(line.strip() for line in html.splitlines() if line.strip())
+
+# Compile once; app.jinja_env keeps Flask's autoescaping for string templates
+_TEMPLATE = app.jinja_env.from_string(_minify(HTML_TEMPLATE))
+
+# Changes whenever the page markup or Hls.js source changes across deploys
+_PAGE_VERSION = format(zlib.crc32(f'{HTML_TEMPLATE}{HLS_JS_SRC}{STREAM_URL}'.encode()), 'x')
+
+def _page_etag():
+    # A GET renders purely from the config file, so its stat identifies the page
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return f'{_PAGE_VERSION}-none'
+    return f'{_PAGE_VERSION}-{st.st_mtime_ns:x}-{st.st_size:x}'
+
+@functools.lru_cache(maxsize=8)
+def _gzip(body):
+    # Pages only change with the config, so repeat GETs reuse the compressed body
+    return gzip.compress(body, compresslevel=6)
+
+def _page_response(html):
+    body = html.encode()
+    response = make_response(body)
+    response.headers['Vary'] = 'Accept-Encoding'
+    if request.accept_encodings['gzip']:
+        response.set_data(_gzip(body))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
 def load_config():
-    config = {}
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, 'r') as f:
-            for line in f:
-                if "=" in line and not line.startswith("#"):
-                    key, value = line.split("=", 1)
-                    config[key.strip()] = value.strip()
-    return config
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return {}
+    sig = (st.st_mtime_ns, st.st_size)
+    entry = _CFG_CACHE['entry']
+    if entry is not None and entry[0] == sig:
+        # Callers mutate the result, so hand out a copy of the cached dict
+        return dict(entry[1])
+
+    with open(CONFIG_FILE, 'r') as f:
+        config = dict(_CFG_RE.findall(f.read()))
+    _CFG_CACHE['entry'] = (sig, config)
+    return dict(config)
 
 def save_config(config):
-    # Write to a temp file then move into place using sudo to avoid permission errors
-    import tempfile
+    # Write to a temp file in the same directory and atomically swap it into
+    # place. That needs write access to the config's own directory, /etc/picam
+    # (root:picam, 775), which pi_camera_ui.service provisions on start; /etc
+    # itself stays root-only.
     tmp_path = None
     fd = None
     try:
-        fd, tmp_path = tempfile.mkstemp(prefix='pi_camera_capture.', suffix='.conf', text=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CONFIG_FILE),
+                                        prefix='.pi_camera_capture.', suffix='.tmp', text=True)
         with os.fdopen(fd, 'w') as f:
-            for key, value in config.items():
-                f.write(f'{key}={value}\n')
+            f.write(''.join(f'{key}={value}\n' for key, value in config.items()))
             f.flush()
             os.fsync(f.fileno())
-        # Move into place with sudo and set ownership/permissions
-        res = subprocess.run(['sudo', 'mv', tmp_path, CONFIG_FILE], capture_output=True, text=True)
-        if res.returncode != 0:
-            raise RuntimeError(f"sudo mv failed: {res.stderr.strip()}")
-        subprocess.run(['sudo', 'chown', 'root:root', CONFIG_FILE])
-        subprocess.run(['sudo', 'chmod', '644', CONFIG_FILE])
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, CONFIG_FILE)
+        _CFG_CACHE['entry'] = None
         return True
     finally:
         # Clean up temp file if it still exists
@@ -178,15 +254,30 @@ def save_config(config):
         except Exception:
             pass
 
+@app.after_request
+def cache_static_hls(response):
+    # The vendored Hls.js filename is versioned, so it never changes in place
+    if request.path == f"/static/{HLS_JS_FILE}" and response.status_code == 200:
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
+    if request.method == 'GET':
+        # Taken before load_config() so a concurrent save can only make it stale, never too new
+        etag = _page_etag()
+        if request.if_none_match.contains_weak(etag):
+            response = make_response('', 304)
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, max-age=0, must-revalidate'
+            return response
+
     config = load_config()
     status = None
     
     if request.method == 'POST':
-        for key in request.form:
-            if key != 'action':
-                config[key.upper()] = request.form[key]
+        form = request.form
+        config.update({key: form[name] for key, name in _FORM_FIELDS if name in form})
         try:
             saved = save_config(config)
             if saved:
@@ -197,21 +288,57 @@ def index():
             app.logger.error('Failed to save configuration: %s', e)
             status = f'Failed to save configuration: {e}'
             # Continue and render page with an error message (don't return HTTP 500)
-            # fall through to render_template_string at the end of the view
+            # fall through to _TEMPLATE.render at the end of the view
         
         if request.form.get('action') == 'restart':
             try:
-                subprocess.run(['sudo', 'systemctl', 'restart', 'pi_camera_capture.service'], check=True)
-                status += ' Service restarted.'
+                # Fire and forget: the restart can take seconds and must not hold the worker
+                subprocess.Popen(['sudo', 'systemctl', 'restart', 'pi_camera_capture.service'],
+                                 start_new_session=True, stdin=subprocess.DEVNULL,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                status += ' Service restart queued.'
             except Exception as e:
                 app.logger.error('Failed to restart service: %s', e)
                 status += f' (failed to restart: {e})'
     
-    return render_template_string(HTML_TEMPLATE, config=config, status=status)
+    response = _page_response(_TEMPLATE.render(config=config, status=status, hls_js_src=HLS_JS_SRC,
+                                               stream_url=STREAM_URL))
+    if request.method == 'GET':
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = 'private, max-age=0, must-revalidate'
+    else:
+        response.headers['Cache-Control'] = 'no-store'
+    return response
 
 REBOOT_TOKEN_FILE = "/etc/pi_reboot_token"
 
-import secrets, hmac
+import secrets, hmac, signal, threading
+
+def _load_reboot_token():
+    try:
+        with open(REBOOT_TOKEN_FILE, 'rb') as f:
+            token = f.read().strip()
+    except Exception as e:
+        app.logger.error('Reboot token missing or unreadable, /admin/reboot disabled: %s', e)
+        return None
+    if not token:
+        app.logger.error('Reboot token file %s is empty, /admin/reboot disabled', REBOOT_TOKEN_FILE)
+        return None
+    return token
+
+_REBOOT_UNCONFIGURED = ('Reboot token not configured on device', 503)
+
+# Loaded once at startup; send SIGHUP to pick up a rotated token
+_REBOOT_EXPECTED = _load_reboot_token()
+
+def _reload_reboot_token(signum, frame):
+    global _REBOOT_EXPECTED
+    _REBOOT_EXPECTED = _load_reboot_token()
+
+# Handlers can only be installed from the main thread; an import from anywhere
+# else (a test runner, an embedding server) keeps the startup token instead
+if threading.current_thread() is threading.main_thread():
+    signal.signal(signal.SIGHUP, _reload_reboot_token)
 
 @app.route('/admin/reboot', methods=['POST'])
 def admin_reboot():
@@ -220,6 +347,11 @@ def admin_reboot():
     Call with header: Authorization: Bearer <token>
     The token is stored on the device at /etc/pi_reboot_token (root:root, 600).
     """
+    # Bail out before touching the request when no token was loaded at startup
+    expected = _REBOOT_EXPECTED
+    if expected is None:
+        return _REBOOT_UNCONFIGURED
+
     # Get token from Authorization header or form
     auth = request.headers.get('Authorization', '')
     token = None
@@ -228,22 +360,16 @@ def admin_reboot():
     else:
         token = request.form.get('token') or request.args.get('token')
 
-    # Load expected token
-    try:
-        with open(REBOOT_TOKEN_FILE, 'r') as f:
-            expected = f.read().strip()
-    except Exception as e:
-        app.logger.error('Reboot token missing or unreadable: %s', e)
-        return ('Reboot token not configured on device', 503)
-
-    if not token or not hmac.compare_digest(token, expected):
+    if not token or not hmac.compare_digest(token.encode(), expected):
         app.logger.warning('Unauthorized reboot attempt from %s', request.remote_addr)
         return ('Forbidden', 403)
 
     # Authorized — trigger reboot (asynchronously)
     try:
         # Use sudo to perform the reboot, service should have sudoers configured
-        subprocess.Popen(['sudo', '/sbin/shutdown', '-r', 'now'])
+        subprocess.Popen(['sudo', '/sbin/shutdown', '-r', 'now'],
+                         start_new_session=True, stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         app.logger.info('Reboot triggered by %s', request.remote_addr)
         return ('Rebooting', 202)
     except Exception as e:
@@ -252,4 +378,16 @@ def admin_reboot():
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=8888)
\ No newline at end of file
+    # Deployed via gunicorn (see pi_camera_ui.service.template); running the
+    # module directly is for local debugging only.
+    if os.environ.get('FLASK_DEV'):
+        # Loopback only: the Werkzeug debugger executes arbitrary code, so it is
+        # never exposed on the LAN and stays off unless FLASK_DEBUG=1 asks for it
+        app.run(host='127.0.0.1', port=8888, debug=os.environ.get('FLASK_DEBUG') == '1')
+    else:
+        try:
+            from waitress import serve
+        except ImportError:
+            app.run(host='0.0.0.0', port=8888, threaded=True)
+        else:
+            serve(app, host='0.0.0.0', port=8888, threads=8)
\ No newline at end of file
@@ -0,0 +1,40 @@
+#!/usr/bin/env bash
+set -euo pipefail
+
+# Vendors the Hls.js build camera_config_ui.py serves from its static folder.
+# The npm tarball is checked against the registry's published integrity hash
+# before anything is copied into place.
+VERSION=1.5.17
+DEST_DIR="$(cd "$(dirname "$0")" && pwd)/static"
+DEST="$DEST_DIR/hls-$VERSION.min.js"
+
+WORK=$(mktemp -d)
+trap 'rm -rf "$WORK"' EXIT
+
+curl -fsSL "https://registry.npmjs.org/hls.js/$VERSION" -o "$WORK/meta.json"
+read -r TARBALL INTEGRITY < <(python3 -c '
+import json, sys
+dist = json.load(open(sys.argv[1]))["dist"]
+print(dist["tarball"], dist["integrity"])
+' "$WORK/meta.json")
+
+case "$INTEGRITY" in
+  sha512-*) ;;
+  *) echo "Unexpected integrity format: $INTEGRITY" >&2; exit 1 ;;
+esac
+
+curl -fsSL "$TARBALL" -o "$WORK/hls.tgz"
+ACTUAL="sha512-$(openssl dgst -sha512 -binary "$WORK/hls.tgz" | base64 -w0)"
+if [ "$ACTUAL" != "$INTEGRITY" ]; then
+  echo "Integrity mismatch for hls.js@$VERSION" >&2
+  echo "  expected $INTEGRITY" >&2
+  echo "  got      $ACTUAL" >&2
+  exit 1
+fi
+
+tar -xzf "$WORK/hls.tgz" -C "$WORK" package/dist/hls.min.js
+mkdir -p "$DEST_DIR"
+install -m 0644 "$WORK/package/dist/hls.min.js" "$DEST"
+
+echo "Installed $DEST"
+echo "Restart the camera UI service to start serving it."
@@ -7,21 +7,31 @@ based on configurable rules (file type, download source, etc.)
 """
 
 import os
+import re
+import errno
 import sys
 import time
 import shutil
 import logging
+import plistlib
 import subprocess
+import threading
 import xattr
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List, Any
-from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Dict, List, Any, Pattern, Tuple
+from urllib.parse import urlparse
+from dataclasses import dataclass, field
 from enum import Enum
 
 import yaml
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileCreatedEvent, FileMovedEvent
+from watchdog.events import (
+    FileSystemEventHandler, FileClosedEvent, FileCreatedEvent, FileModifiedEvent, FileMovedEvent
+)
 
 
 # =============================================================================
@@ -67,6 +77,8 @@ class WatchRule:
     type_rules: List[TypeRule]
     redirect_destination: str
     source_directories: List[str]  # Relative paths where files are picked up from
+    extension_index: Dict[str, TypeRule] = field(default_factory=dict)  # ext -> first matching type rule
+    redirect_regex: Optional[Pattern[str]] = None  # Alternation of lowercased redirect_domains
 
 
 # =============================================================================
@@ -78,14 +90,16 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[Path] = None) -> l
     logger = logging.getLogger("HazelReplacement")
     logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
     
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.DEBUG)
-    console_format = logging.Formatter(
+    # Shared by both handlers
+    log_format = logging.Formatter(
         '%(asctime)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    console_handler.setFormatter(console_format)
+    
+    # Console handler
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.DEBUG)
+    console_handler.setFormatter(log_format)
     logger.addHandler(console_handler)
     
     # File handler
@@ -93,11 +107,7 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[Path] = None) -> l
         log_file.parent.mkdir(parents=True, exist_ok=True)
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(logging.DEBUG)
-        file_format = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        file_handler.setFormatter(file_format)
+        file_handler.setFormatter(log_format)
         logger.addHandler(file_handler)
     
     return logger
@@ -107,6 +117,16 @@ def setup_logging(log_level: str = "INFO", log_file: Optional[Path] = None) -> l
 # Configuration Loading
 # =============================================================================
 
+# Prefer libyaml's C loader; it's several times faster than the pure-Python one
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Last parsed config keyed on (resolved path, st_mtime_ns); treat it as read-only
+_config_cache: Dict[Tuple[Path, int], Dict[str, Any]] = {}
+
+
 def load_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
     """Load configuration from YAML file."""
     if config_path is None:
@@ -118,8 +138,25 @@ def load_config(config_path: Optional[Path] = None) -> Dict[str, Any]:
         else:
             raise FileNotFoundError(f"No configuration file found at {CONFIG_FILE} or {DEFAULT_CONFIG_FILE}")
     
+    config_path = Path(config_path)
+    key = (config_path.resolve(), config_path.stat().st_mtime_ns)
+    cached = _config_cache.get(key)
+    if cached is not None:
+        return cached
+    
     with open(config_path, 'r') as f:
-        return yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
+    
+    _config_cache.clear()
+    _config_cache[key] = config
+    return config
+
+
+def compile_redirect_regex(redirect_domains: List[str]) -> Optional[Pattern[str]]:
+    """Build one regex matching any redirect domain as a substring, or None if empty."""
+    if not redirect_domains:
+        return None
+    return re.compile('|'.join(re.escape(pattern.lower()) for pattern in redirect_domains))
 
 
 def parse_watch_rules(config: Dict[str, Any]) -> List[WatchRule]:
@@ -155,15 +192,25 @@ def parse_watch_rules(config: Dict[str, Any]) -> List[WatchRule]:
         # Parse source directories (default to just root)
         source_dirs = rule_config.get('source_directories', ['.'])
         
+        # Index extensions so lookup is a single dict hit; earlier rules win
+        extension_index: Dict[str, TypeRule] = {}
+        for type_rule in type_rules:
+            for ext in type_rule.extensions:
+                extension_index.setdefault(ext, type_rule)
+        
+        redirect_domains = rule_config.get('redirect_domains', [])
+        
         rules.append(WatchRule(
             name=rule_config['name'],
             watch_directory=watch_dir,
             enabled=rule_config.get('enabled', True),
-            redirect_domains=rule_config.get('redirect_domains', []),
+            redirect_domains=redirect_domains,
             domain_rules=domain_rules,
             type_rules=type_rules,
             redirect_destination=rule_config.get('redirect_destination', 'tmp'),
-            source_directories=source_dirs
+            source_directories=source_dirs,
+            extension_index=extension_index,
+            redirect_regex=compile_redirect_regex(redirect_domains)
         ))
     
     return rules
@@ -173,82 +220,113 @@ def parse_watch_rules(config: Dict[str, Any]) -> List[WatchRule]:
 # Download Source Detection
 # =============================================================================
 
-def get_download_source(file_path: Path) -> Optional[str]:
+WHERE_FROM_KEY = 'com.apple.metadata:kMDItemWhereFroms'
+
+
+DOWNLOAD_SOURCE_CACHE_SIZE = 1024
+# (st_dev, st_ino, st_mtime_ns, st_ctime_ns) -> (url, domain). Setting an xattr
+# only bumps ctime, so ctime is part of the key: a where-from attribute added
+# after the last write must not be masked by a cached "no source" result.
+_download_source_cache: "OrderedDict[Tuple[int, int, int, int], Tuple[Optional[str], Optional[str]]]" = OrderedDict()
+_download_source_lock = threading.Lock()
+
+
+def get_download_source(file_path: Path,
+                        stat_result: Optional[os.stat_result] = None) -> Tuple[Optional[str], Optional[str]]:
     """
-    Extract the download source URL from macOS extended attributes.
+    Extract the download source URL and its domain from macOS extended attributes.
     
     macOS stores download information in the 'com.apple.metadata:kMDItemWhereFroms'
     extended attribute when files are downloaded via Safari, Chrome, etc.
+    Returns (None, None) when there is no source. Results are cached per
+    inode + mtime + ctime; pass stat_result to reuse a stat the caller already has.
     """
     try:
-        attrs = xattr.xattr(str(file_path))
-        
-        # Check for the "where from" attribute (contains download URL)
-        where_from_key = 'com.apple.metadata:kMDItemWhereFroms'
+        if stat_result is None:
+            stat_result = file_path.stat()
+    except OSError:
+        return None, None
+    
+    key = (stat_result.st_dev, stat_result.st_ino, stat_result.st_mtime_ns, stat_result.st_ctime_ns)
+    with _download_source_lock:
+        cached = _download_source_cache.get(key)
+        if cached is not None:
+            _download_source_cache.move_to_end(key)
+            return cached
+    
+    url = _read_download_source(str(file_path))
+    result = (url, extract_domain(url) if url else None)
+    
+    with _download_source_lock:
+        _download_source_cache[key] = result
+        if len(_download_source_cache) > DOWNLOAD_SOURCE_CACHE_SIZE:
+            _download_source_cache.popitem(last=False)
+    return result
+
+
+def _read_download_source(path: str) -> Optional[str]:
+    """Read and parse the "where from" attribute."""
+    try:
+        # One listxattr call settles the common no-attribute case
+        if WHERE_FROM_KEY not in xattr.listxattr(path):
+            return None
         
-        if where_from_key in attrs:
-            import plistlib
-            data = attrs[where_from_key]
-            urls = plistlib.loads(data)
-            
-            if urls and len(urls) > 0:
-                return urls[0]  # First URL is typically the direct download source
+        urls = plistlib.loads(xattr.getxattr(path, WHERE_FROM_KEY))
+        if urls and len(urls) > 0:
+            return urls[0]  # First URL is typically the direct download source
         
         return None
     except Exception:
         return None
 
 
+@lru_cache(maxsize=1024)
 def extract_domain(url: str) -> Optional[str]:
-    """Extract domain from URL."""
+    """Extract domain from URL (cached, since each URL is looked up more than once)."""
     try:
-        from urllib.parse import urlparse
         parsed = urlparse(url)
         return parsed.netloc.lower()
     except Exception:
         return None
 
 
-def matches_redirect_domain(url: str, redirect_domains: List[str]) -> bool:
+def matches_redirect_domain(url: str, rule: WatchRule) -> bool:
     """
-    Check if the download URL matches any redirect domain pattern.
+    Check if the download URL matches any of the rule's redirect domain patterns.
     Supports partial matching (e.g., 'facebook' matches 'www.facebook.com').
     """
-    if not url:
+    if not url or rule.redirect_regex is None:
         return False
     
     domain = extract_domain(url)
     if not domain:
         return False
     
-    domain_lower = domain.lower()
-    
-    for pattern in redirect_domains:
-        pattern_lower = pattern.lower()
-        if pattern_lower in domain_lower:
-            return True
-    
-    return False
+    return rule.redirect_regex.search(domain) is not None
 
 
 # =============================================================================
 # File Organization
 # =============================================================================
 
+# Non-hidden names to ignore; dot-files like .DS_Store are already skipped as hidden
+SKIP_NAMES = frozenset({'Thumbs.db'})
+
+
 def get_file_extension(file_path: Path) -> str:
     """Get lowercase file extension including the dot."""
     return file_path.suffix.lower()
 
 
-def find_matching_type_rule(file_path: Path, type_rules: List[TypeRule]) -> Optional[TypeRule]:
+def find_matching_type_rule(file_path: Path, rule: WatchRule) -> Optional[TypeRule]:
     """Find a type rule that matches the file extension."""
-    ext = get_file_extension(file_path)
-    
-    for rule in type_rules:
-        if ext in rule.extensions:
-            return rule
-    
-    return None
+    return rule.extension_index.get(get_file_extension(file_path))
+
+
+def get_source_paths(rule: WatchRule) -> List[Path]:
+    """Resolve a rule's source directories ('.' is the watch directory itself)."""
+    return [rule.watch_directory if src_dir == '.' else rule.watch_directory / src_dir
+            for src_dir in rule.source_directories]
 
 
 def ensure_directory(directory: Path) -> None:
@@ -278,6 +356,16 @@ def generate_unique_filename(destination: Path, original_name: str) -> Path:
         counter += 1
 
 
+_destination_locks: Dict[Path, threading.Lock] = defaultdict(threading.Lock)
+_destination_locks_guard = threading.Lock()
+
+
+def get_destination_lock(destination_dir: Path) -> threading.Lock:
+    """Return the lock serializing moves into destination_dir."""
+    with _destination_locks_guard:
+        return _destination_locks[destination_dir]
+
+
 def move_file(source: Path, destination_dir: Path, logger: logging.Logger) -> bool:
     """
     Move a file to the destination directory.
@@ -285,67 +373,77 @@ def move_file(source: Path, destination_dir: Path, logger: logging.Logger) -> bo
     """
     try:
         ensure_directory(destination_dir)
-        dest_file = generate_unique_filename(destination_dir, source.name)
-        
-        shutil.move(str(source), str(dest_file))
-        logger.info(f"Moved: {source.name} -> {dest_file}")
+        # Hold the directory's lock so concurrent moves can't pick the same name
+        with get_destination_lock(destination_dir):
+            dest_file = generate_unique_filename(destination_dir, source.name)
+            # A same-filesystem move is a single rename; shutil only needs to
+            # copy + delete when crossing devices
+            try:
+                os.rename(source, dest_file)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(str(source), str(dest_file))
+        logger.info("Moved: %s -> %s", source.name, dest_file)
         return True
     except Exception as e:
-        logger.error(f"Failed to move {source}: {e}")
+        logger.error("Failed to move %s: %s", source, e)
         return False
 
 
-def is_file_ready(file_path: Path, wait_time: float = 0.5) -> bool:
+def is_file_ready(file_path: Path, min_age: float = 1.0,
+                  stat_result: Optional[os.stat_result] = None) -> bool:
     """
     Check if a file is ready (not still being written).
-    Compares file size at two points in time.
+    A file counts as settled once it hasn't been modified for min_age seconds;
+    pass stat_result to reuse a stat the caller already has.
     """
     try:
-        if not file_path.exists():
-            return False
-        
-        size1 = file_path.stat().st_size
-        time.sleep(wait_time)
-        
-        if not file_path.exists():
-            return False
-        
-        size2 = file_path.stat().st_size
-        
-        # File is ready if size is stable (allow 0-byte files too)
-        return size1 == size2
+        if stat_result is None:
+            stat_result = file_path.stat()
+        return time.time() - stat_result.st_mtime >= min_age
     except Exception:
         return False
 
 
-def process_file(file_path: Path, rule: WatchRule, logger: logging.Logger) -> None:
-    """Process a single file according to the watch rule."""
+def process_file(file_path: Path, rule: WatchRule, logger: logging.Logger,
+                 skip_readiness: bool = False,
+                 stat_result: Optional[os.stat_result] = None) -> None:
+    """
+    Process a single file according to the watch rule.
+    Pass skip_readiness=True when the caller already knows the file is no
+    longer being written (e.g. after the event handler's debounce window),
+    and stat_result when the caller already stat'ed a regular file.
+    """
     
-    # Skip directories
-    if file_path.is_dir():
+    # Name-only filters first: hidden files (incl. .DS_Store, .localized) and temp files
+    name = file_path.name
+    if name.startswith('.') or name.endswith('.tmp') or name in SKIP_NAMES:
         return
     
-    # Skip hidden files and temp files
-    if file_path.name.startswith('.') or file_path.name.endswith('.tmp'):
+    # Skip directories
+    if stat_result is None and file_path.is_dir():
         return
     
-    # Skip .DS_Store and similar
-    if file_path.name in ['.DS_Store', 'Thumbs.db', '.localized']:
+    # Skip files that are still being written
+    if not skip_readiness and not is_file_ready(file_path, stat_result=stat_result):
+        logger.debug("File not ready yet: %s", file_path.name)
         return
     
-    # Wait for file to be fully written
-    if not is_file_ready(file_path):
-        logger.debug(f"File not ready yet: {file_path.name}")
-        return
+    logger.debug("Processing: %s", file_path.name)
     
-    logger.debug(f"Processing: {file_path.name}")
+    # In-memory type lookup up front; the xattr read below is only needed
+    # when the rule has domain-based routing at all
+    type_rule = find_matching_type_rule(file_path, rule)
     
-    # Check download source for domain redirect
-    download_url = get_download_source(file_path)
+    if rule.domain_rules or rule.redirect_regex is not None:
+        # Check download source for domain redirect
+        download_url, domain = get_download_source(file_path, stat_result)
+    else:
+        download_url, domain = None, None
     
     if download_url:
-        domain = extract_domain(download_url)
-        domain_lower = domain.lower() if domain else ""
+        domain_lower = domain or ""
         ext = get_file_extension(file_path)
 
         # 1. Check for specific domain rules first (more granular)
@@ -353,7 +451,7 @@ def process_file(file_path: Path, rule: WatchRule, logger: logging.Logger) -> No
             if dr.domain.lower() in domain_lower:
                 # Check if extensions match (if specified)
                 if not dr.extensions or ext in dr.extensions:
-                    logger.info(f"Domain rule match ({dr.name}): {file_path.name}")
+                    logger.info("Domain rule match (%s): %s", dr.name, file_path.name)
                     
                     # Handle destination (expand ~ and handle relative paths)
                     dest_path = Path(os.path.expanduser(dr.destination))
@@ -366,17 +464,15 @@ def process_file(file_path: Path, rule: WatchRule, logger: logging.Logger) -> No
                     return
 
         # 2. Check for general redirect domains (legacy behavior)
-        if matches_redirect_domain(download_url, rule.redirect_domains):
-            logger.info(f"Domain redirect match ({domain}): {file_path.name}")
+        if matches_redirect_domain(download_url, rule):
+            logger.info("Domain redirect match (%s): %s", domain, file_path.name)
             dest_dir = rule.watch_directory / rule.redirect_destination
             move_file(file_path, dest_dir, logger)
             return
     
     # 3. Check file type rules
-    type_rule = find_matching_type_rule(file_path, rule.type_rules)
-    
     if type_rule:
-        logger.info(f"Type match ({type_rule.name}): {file_path.name}")
+        logger.info("Type match (%s): %s", type_rule.name, file_path.name)
         
         # Handle destination (expand ~ and handle relative paths)
         dest_path = Path(os.path.expanduser(type_rule.destination))
@@ -388,7 +484,7 @@ def process_file(file_path: Path, rule: WatchRule, logger: logging.Logger) -> No
         move_file(file_path, dest_dir, logger)
         return
     
-    logger.debug(f"No matching rule for: {file_path.name}")
+    logger.debug("No matching rule for: %s", file_path.name)
 
 
 # =============================================================================
@@ -396,7 +492,14 @@ def process_file(file_path: Path, rule: WatchRule, logger: logging.Logger) -> No
 # =============================================================================
 
 class HazelEventHandler(FileSystemEventHandler):
-    """Handles file system events for automatic file organization."""
+    """
+    Handles file system events for automatic file organization.
+
+    Events only record the path in a debounce queue so the observer thread is
+    never blocked; a background worker processes each path once it has been
+    quiet for debounce_seconds, or right away once its writer closes it where
+    the platform reports close events.
+    """
     
     def __init__(self, rule: WatchRule, logger: logging.Logger):
         super().__init__()
@@ -404,6 +507,14 @@ class HazelEventHandler(FileSystemEventHandler):
         self.logger = logger
         self.processing_queue: Dict[str, float] = {}
         self.debounce_seconds = 2.0  # Wait 2 seconds before processing
+        self.poll_interval = 0.2  # How often the worker checks the queue
+        self._source_paths = frozenset(get_source_paths(rule))
+        # inotify reports IN_CLOSE_WRITE; FSEvents on macOS has no close event
+        self.close_events_supported = sys.platform.startswith('linux')
+        self._queue_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._worker = threading.Thread(target=self._drain_queue, daemon=True)
+        self._worker.start()
     
     def _should_process(self, event) -> bool:
         """Determine if the event should be processed."""
@@ -411,29 +522,57 @@ class HazelEventHandler(FileSystemEventHandler):
         if event.is_directory:
             return False
         
-        # Get the file path
+        # Watches are non-recursive and scoped to the source directories, but a
+        # move out to a sibling destination can still report the new location
         file_path = Path(event.dest_path if hasattr(event, 'dest_path') and event.dest_path else event.src_path)
-        
-        # Check if file is in one of the allowed source directories
-        file_parent = file_path.parent
-        allowed = False
-        for src_dir in self.rule.source_directories:
-            if src_dir == '.':
-                allowed_path = self.rule.watch_directory
-            else:
-                allowed_path = self.rule.watch_directory / src_dir
-            if file_parent == allowed_path:
-                allowed = True
-                break
-        
-        if not allowed:
-            return False
-        
-        return True
+        return file_path.parent in self._source_paths
     
     def _queue_for_processing(self, file_path: Path) -> None:
         """Queue a file for processing with debouncing."""
-        self.processing_queue[str(file_path)] = time.time()
+        with self._queue_lock:
+            self.processing_queue[str(file_path)] = time.monotonic()
+    
+    def _process_due(self, now: Optional[float] = None) -> None:
+        """Process every queued file that has been quiet for debounce_seconds."""
+        if now is None:
+            now = time.monotonic()
+        
+        with self._queue_lock:
+            due = [path for path, queued_at in self.processing_queue.items()
+                   if now - queued_at >= self.debounce_seconds]
+            for path in due:
+                del self.processing_queue[path]
+        
+        # Process outside the lock so new events can keep queueing
+        for path in due:
+            file_path = Path(path)
+            try:
+                stat_result = file_path.stat()
+            except OSError:
+                continue
+            
+            # Without close events a quiet queue entry may still be mid-write;
+            # the mtime check costs no extra syscall since we already stat'ed
+            if not self.close_events_supported and not is_file_ready(file_path, stat_result=stat_result):
+                with self._queue_lock:
+                    self.processing_queue.setdefault(path, now)
+                continue
+            
+            try:
+                process_file(file_path, self.rule, self.logger,
+                             skip_readiness=True, stat_result=stat_result)
+            except Exception as e:
+                self.logger.error("Failed to process %s: %s", file_path, e)
+    
+    def _drain_queue(self) -> None:
+        """Background worker loop."""
+        while not self._stop_event.wait(self.poll_interval):
+            self._process_due()
+    
+    def stop(self) -> None:
+        """Stop the background worker."""
+        self._stop_event.set()
+        self._worker.join()
     
     def on_created(self, event: FileCreatedEvent) -> None:
         """Handle file creation events."""
@@ -441,22 +580,39 @@ class HazelEventHandler(FileSystemEventHandler):
             return
         
         file_path = Path(event.src_path)
-        self.logger.debug(f"File created: {file_path.name}")
+        self.logger.debug("File created: %s", file_path.name)
+        self._queue_for_processing(file_path)
+    
+    def on_modified(self, event: FileModifiedEvent) -> None:
+        """Push back processing of a queued file that is still being written."""
+        if event.is_directory:
+            return
+        
+        with self._queue_lock:
+            if event.src_path in self.processing_queue:
+                self.processing_queue[event.src_path] = time.monotonic()
+    
+    def on_closed(self, event: FileClosedEvent) -> None:
+        """The writer closed a queued file, so process it on the next worker tick."""
+        if event.is_directory:
+            return
         
-        # Process with a small delay to ensure file is fully written
-        time.sleep(1)
-        process_file(file_path, self.rule, self.logger)
+        with self._queue_lock:
+            if event.src_path in self.processing_queue:
+                self.processing_queue[event.src_path] = time.monotonic() - self.debounce_seconds
     
     def on_moved(self, event: FileMovedEvent) -> None:
         """Handle file move events (files moved INTO the watched directory)."""
+        # A renamed download (e.g. foo.crdownload -> foo) no longer exists at its old path
+        with self._queue_lock:
+            self.processing_queue.pop(event.src_path, None)
+        
         if not self._should_process(event):
             return
         
         file_path = Path(event.dest_path)
-        self.logger.debug(f"File moved in: {file_path.name}")
-        
-        time.sleep(0.5)
-        process_file(file_path, self.rule, self.logger)
+        self.logger.debug("File moved in: %s", file_path.name)
+        self._queue_for_processing(file_path)
 
 
 # =============================================================================
@@ -466,6 +622,8 @@ class HazelEventHandler(FileSystemEventHandler):
 class HazelService:
     """Main service class that manages file watching."""
     
+    EXISTING_FILES_WORKERS = 8  # Thread pool size for the startup scan
+    
     def __init__(self, config_path: Optional[Path] = None):
         self.config = load_config(config_path)
         self.rules = parse_watch_rules(self.config)
@@ -482,7 +640,9 @@ class HazelService:
         
         self.logger = setup_logging(log_level, log_file)
         
-        self.observers: List[Observer] = []
+        # A single observer multiplexes every rule's watches onto one thread
+        self.observer = Observer()
+        self.handlers: List[HazelEventHandler] = []
         self.running = False
     
     def _setup_directories(self) -> None:
@@ -491,6 +651,11 @@ class HazelService:
             # Create watch directory
             ensure_directory(rule.watch_directory)
             
+            # Create source directories: their watches are not recursive, so one
+            # missing at startup would otherwise never be watched
+            for source_path in get_source_paths(rule):
+                ensure_directory(source_path)
+            
             # Create redirect destination
             ensure_directory(rule.watch_directory / rule.redirect_destination)
             
@@ -514,23 +679,37 @@ class HazelService:
         """Process any existing files in watch directories on startup."""
         self.logger.info("Processing existing files...")
         
+        jobs: List[Tuple[Path, WatchRule, os.stat_result]] = []
+        
         for rule in self.rules:
             if not rule.watch_directory.exists():
                 continue
             
-            # Process files in each source directory
-            for src_dir in rule.source_directories:
-                if src_dir == '.':
-                    scan_dir = rule.watch_directory
-                else:
-                    scan_dir = rule.watch_directory / src_dir
-                
+            # Collect files in each source directory
+            for scan_dir in get_source_paths(rule):
                 if not scan_dir.exists():
                     continue
                 
-                for file_path in scan_dir.iterdir():
-                    if file_path.is_file():
-                        process_file(file_path, rule, self.logger)
+                # scandir hands back type info and a cached stat, so hidden and
+                # skipped names are filtered without touching the disk again.
+                # Symlinks are followed like os.path.isfile did: links to files
+                # are moved, dangling links are left alone.
+                with os.scandir(scan_dir) as entries:
+                    for entry in entries:
+                        if not entry.is_file():
+                            continue
+                        if entry.name.startswith('.') or entry.name in SKIP_NAMES:
+                            continue
+                        jobs.append((Path(entry.path), rule, entry.stat()))
+        
+        def process_job(job: Tuple[Path, WatchRule, os.stat_result]) -> None:
+            file_path, rule, stat_result = job
+            # Files already present at startup aren't being written, so skip the readiness wait
+            process_file(file_path, rule, self.logger, skip_readiness=True, stat_result=stat_result)
+        
+        # The per-file work is I/O bound and independent, so run it concurrently
+        with ThreadPoolExecutor(max_workers=self.EXISTING_FILES_WORKERS) as pool:
+            list(pool.map(process_job, jobs))
     
     def start(self) -> None:
         """Start the file watching service."""
@@ -544,15 +723,21 @@ class HazelService:
         # Process existing files
         self._process_existing_files()
         
-        # Setup observers for each rule
+        # Schedule every rule on the one shared observer
         for rule in self.rules:
-            self.logger.info(f"Watching: {rule.watch_directory} ({rule.name})")
+            self.logger.info("Watching: %s (%s)", rule.watch_directory, rule.name)
             
             event_handler = HazelEventHandler(rule, self.logger)
-            observer = Observer()
-            observer.schedule(event_handler, str(rule.watch_directory), recursive=True)
-            observer.start()
-            self.observers.append(observer)
+            self.handlers.append(event_handler)
+            # One non-recursive watch per source directory, so events from
+            # destination subfolders never reach the handler
+            for source_path in get_source_paths(rule):
+                if not source_path.is_dir():
+                    self.logger.warning("Source directory missing, not watching: %s", source_path)
+                    continue
+                self.observer.schedule(event_handler, str(source_path), recursive=False)
+        
+        self.observer.start()
         
         self.running = True
         self.logger.info("Service started successfully")
@@ -566,11 +751,14 @@ class HazelService:
         self.logger.info("Stopping service...")
         self.running = False
         
-        for observer in self.observers:
-            observer.stop()
-            observer.join()
+        if self.observer.is_alive():
+            self.observer.stop()
+            self.observer.join()
+        
+        for handler in self.handlers:
+            handler.stop()
         
-        self.observers.clear()
+        self.handlers.clear()
         
         # Remove PID file
         if PID_FILE.exists():
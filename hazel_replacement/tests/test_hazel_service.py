@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Tests for the legacy Hazel Replacement service."""
+
+import errno
+import os
+import plistlib
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import hazel_service
+from hazel_service import (
+    HazelEventHandler,
+    HazelService,
+    WatchRule,
+    WHERE_FROM_KEY,
+    get_download_source,
+    parse_watch_rules,
+    find_matching_type_rule,
+    matches_redirect_domain,
+)
+from watchdog.events import FileClosedEvent, FileCreatedEvent, FileModifiedEvent, FileMovedEvent
+
+
+def make_rule(watch_dir: Path, **overrides) -> WatchRule:
+    fields = dict(
+        name="Downloads",
+        watch_directory=watch_dir,
+        enabled=True,
+        redirect_domains=[],
+        domain_rules=[],
+        type_rules=[],
+        redirect_destination="tmp",
+        source_directories=["."],
+    )
+    fields.update(overrides)
+    return WatchRule(**fields)
+
+
+@pytest.fixture
+def handler(tmp_path):
+    h = HazelEventHandler(make_rule(tmp_path), MagicMock())
+    yield h
+    h.stop()
+
+
+class TestHazelEventHandlerDebounce:
+    def test_created_event_is_queued_not_processed(self, tmp_path, handler):
+        f = tmp_path / "a.pdf"
+        f.write_text("x")
+        with patch.object(hazel_service, "process_file") as mock_process:
+            handler.on_created(FileCreatedEvent(str(f)))
+        mock_process.assert_not_called()
+        assert str(f) in handler.processing_queue
+
+    def test_only_quiet_entries_are_processed(self, tmp_path, handler):
+        old = tmp_path / "old.pdf"
+        new = tmp_path / "new.pdf"
+        old.write_text("x")
+        new.write_text("x")
+        handler.processing_queue = {str(old): 100.0, str(new): 101.5}
+
+        with patch.object(hazel_service, "process_file") as mock_process:
+            handler._process_due(now=102.0)
+
+        mock_process.assert_called_once()
+        args, kwargs = mock_process.call_args
+        assert args == (old, handler.rule, handler.logger)
+        assert kwargs["skip_readiness"] is True
+        assert list(handler.processing_queue) == [str(new)]
+
+    def test_closed_event_makes_pending_file_due(self, tmp_path, handler):
+        f = tmp_path / "a.pdf"
+        f.write_text("x")
+        handler.on_created(FileCreatedEvent(str(f)))
+        handler.on_closed(FileClosedEvent(str(f)))
+        with patch.object(hazel_service, "process_file") as mock_process:
+            handler._process_due()
+        mock_process.assert_called_once()
+        assert handler.processing_queue == {}
+
+    def test_recently_modified_file_is_requeued_without_close_events(self, tmp_path, handler):
+        f = tmp_path / "a.pdf"
+        f.write_text("x")
+        handler.close_events_supported = False
+        handler.processing_queue = {str(f): 0.0}
+        with patch.object(hazel_service, "process_file") as mock_process:
+            handler._process_due(now=10.0)
+        mock_process.assert_not_called()
+        assert handler.processing_queue == {str(f): 10.0}
+
+    def test_vanished_file_is_dropped(self, tmp_path, handler):
+        handler.processing_queue = {str(tmp_path / "gone.pdf"): 0.0}
+        with patch.object(hazel_service, "process_file") as mock_process:
+            handler._process_due(now=10.0)
+        mock_process.assert_not_called()
+        assert handler.processing_queue == {}
+
+    def test_modified_refreshes_only_pending_files(self, tmp_path, handler):
+        pending = str(tmp_path / "pending.zip")
+        handler.processing_queue = {pending: 0.0}
+        handler.on_modified(FileModifiedEvent(pending))
+        handler.on_modified(FileModifiedEvent(str(tmp_path / "other.zip")))
+        assert handler.processing_queue[pending] > 0.0
+        assert list(handler.processing_queue) == [pending]
+
+    def test_moved_replaces_source_entry(self, tmp_path, handler):
+        src = str(tmp_path / "a.pdf.crdownload")
+        dest = str(tmp_path / "a.pdf")
+        handler.processing_queue = {src: 0.0}
+        handler.on_moved(FileMovedEvent(src, dest))
+        assert list(handler.processing_queue) == [dest]
+
+    def test_files_outside_source_directories_are_ignored(self, tmp_path, handler):
+        sub = tmp_path / "Documents"
+        sub.mkdir()
+        handler.on_created(FileCreatedEvent(str(sub / "a.pdf")))
+        assert handler.processing_queue == {}
+
+
+class TestIsFileReady:
+    def test_recently_written_file_is_not_ready(self, tmp_path):
+        f = tmp_path / "a.pdf"
+        f.write_text("x")
+        assert not hazel_service.is_file_ready(f)
+
+    def test_settled_file_is_ready(self, tmp_path):
+        f = tmp_path / "a.pdf"
+        f.write_text("x")
+        os.utime(f, (0, 0))
+        assert hazel_service.is_file_ready(f)
+
+    def test_missing_file_is_not_ready(self, tmp_path):
+        assert not hazel_service.is_file_ready(tmp_path / "missing.pdf")
+
+
+class TestGetDownloadSource:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        hazel_service._download_source_cache.clear()
+
+    def test_no_where_from_attribute(self, tmp_path):
+        f = tmp_path / "a.pdf"
+        f.write_text("x")
+        with patch.object(hazel_service.xattr, "listxattr", return_value=()), \
+             patch.object(hazel_service.xattr, "getxattr") as mock_get:
+            assert get_download_source(f) == (None, None)
+        mock_get.assert_not_called()
+
+    def test_returns_first_url_and_domain_and_caches(self, tmp_path):
+        f = tmp_path / "a.pdf"
+        f.write_text("x")
+        data = plistlib.dumps(["https://Example.com/a.pdf", "https://example.com/"])
+        with patch.object(hazel_service.xattr, "listxattr", return_value=(WHERE_FROM_KEY,)) as mock_list, \
+             patch.object(hazel_service.xattr, "getxattr", return_value=data):
+            assert get_download_source(f) == ("https://Example.com/a.pdf", "example.com")
+            assert get_download_source(f) == ("https://Example.com/a.pdf", "example.com")
+        assert mock_list.call_count == 1
+
+    def test_xattr_set_after_write_is_not_masked_by_cache(self, tmp_path):
+        f = tmp_path / "a.pdf"
+        f.write_text("x")
+        before = SimpleNamespace(st_dev=1, st_ino=2, st_mtime_ns=3, st_ctime_ns=3)
+        # Setting the where-from xattr bumps ctime but leaves mtime alone
+        after = SimpleNamespace(st_dev=1, st_ino=2, st_mtime_ns=3, st_ctime_ns=4)
+        data = plistlib.dumps(["https://example.com/a.pdf"])
+        with patch.object(hazel_service.xattr, "listxattr", return_value=()):
+            assert get_download_source(f, before) == (None, None)
+        with patch.object(hazel_service.xattr, "listxattr", return_value=(WHERE_FROM_KEY,)), \
+             patch.object(hazel_service.xattr, "getxattr", return_value=data):
+            assert get_download_source(f, before) == (None, None)
+            assert get_download_source(f, after) == ("https://example.com/a.pdf", "example.com")
+
+    def test_missing_file(self, tmp_path):
+        assert get_download_source(tmp_path / "missing.pdf") == (None, None)
+
+
+class TestRuleMatching:
+    @pytest.fixture
+    def rule(self, tmp_path):
+        config = {
+            "watch_rules": [{
+                "name": "Downloads",
+                "watch_directory": str(tmp_path),
+                "redirect_domains": ["Facebook", "tiktok"],
+                "type_rules": {
+                    "Images": {"extensions": [".JPG", ".png"], "destination": "Images"},
+                    "Photos": {"extensions": [".jpg"], "destination": "Photos"},
+                    "Docs": {"extensions": [".pdf"], "destination": "Docs"},
+                },
+            }],
+        }
+        return parse_watch_rules(config)[0]
+
+    def test_extension_index_prefers_first_rule(self, rule):
+        assert rule.extension_index[".jpg"].name == "Images"
+        assert rule.extension_index[".pdf"].name == "Docs"
+
+    def test_find_matching_type_rule(self, rule):
+        assert find_matching_type_rule(Path("scan.PDF"), rule).name == "Docs"
+        assert find_matching_type_rule(Path("song.mp3"), rule) is None
+
+    def test_matches_redirect_domain(self, rule):
+        assert matches_redirect_domain("https://scontent.www.facebook.com/x.jpg", rule)
+        assert matches_redirect_domain("https://v16.TikTok.com/x.mp4", rule)
+        assert not matches_redirect_domain("https://example.com/x.jpg", rule)
+        assert not matches_redirect_domain("", rule)
+
+    def test_no_redirect_domains(self, tmp_path):
+        rule = make_rule(tmp_path)
+        assert rule.redirect_regex is None
+        assert not matches_redirect_domain("https://facebook.com/x.jpg", rule)
+
+    def test_redirect_patterns_are_escaped(self, tmp_path):
+        rule = make_rule(tmp_path, redirect_regex=hazel_service.compile_redirect_regex(["a.b"]))
+        assert matches_redirect_domain("https://x.a.b.com/f", rule)
+        assert not matches_redirect_domain("https://axb.com/f", rule)
+
+
+class TestMoveFile:
+    def test_same_filesystem_uses_rename(self, tmp_path):
+        src = tmp_path / "a.pdf"
+        src.write_text("x")
+        with patch.object(hazel_service.shutil, "move") as mock_move:
+            assert hazel_service.move_file(src, tmp_path / "Docs", MagicMock())
+        mock_move.assert_not_called()
+        assert (tmp_path / "Docs" / "a.pdf").read_text() == "x"
+        assert not src.exists()
+
+    def test_cross_device_falls_back_to_shutil(self, tmp_path):
+        src = tmp_path / "a.pdf"
+        src.write_text("x")
+        with patch.object(hazel_service.os, "rename", side_effect=OSError(errno.EXDEV, "cross-device")), \
+             patch.object(hazel_service.shutil, "move") as mock_move:
+            assert hazel_service.move_file(src, tmp_path / "Docs", MagicMock())
+        mock_move.assert_called_once_with(str(src), str(tmp_path / "Docs" / "a.pdf"))
+
+
+class TestLoadConfig:
+    def test_reparses_only_when_file_changes(self, tmp_path):
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("settings:\n  log_level: INFO\n")
+        first = hazel_service.load_config(config_file)
+        assert hazel_service.load_config(config_file) is first
+
+        config_file.write_text("settings:\n  log_level: DEBUG\n")
+        os.utime(config_file, ns=(0, 10**9))
+        assert hazel_service.load_config(config_file)["settings"]["log_level"] == "DEBUG"
+
+
+class TestProcessFile:
+    def test_type_only_rule_skips_xattr_lookup(self, tmp_path):
+        f = tmp_path / "a.pdf"
+        f.write_text("x")
+        rule = make_rule(tmp_path, extension_index={".pdf": hazel_service.TypeRule("Docs", [".pdf"], "Docs")})
+        with patch.object(hazel_service, "get_download_source") as mock_source:
+            hazel_service.process_file(f, rule, MagicMock(), skip_readiness=True)
+        mock_source.assert_not_called()
+        assert (tmp_path / "Docs" / "a.pdf").exists()
+
+    def test_redirect_domain_beats_type_rule(self, tmp_path):
+        f = tmp_path / "a.pdf"
+        f.write_text("x")
+        rule = make_rule(
+            tmp_path,
+            redirect_regex=hazel_service.compile_redirect_regex(["facebook"]),
+            extension_index={".pdf": hazel_service.TypeRule("Docs", [".pdf"], "Docs")},
+        )
+        with patch.object(hazel_service, "get_download_source",
+                          return_value=("https://www.facebook.com/a.pdf", "www.facebook.com")):
+            hazel_service.process_file(f, rule, MagicMock(), skip_readiness=True)
+        assert (tmp_path / "tmp" / "a.pdf").exists()
+
+    def test_skip_names(self, tmp_path):
+        f = tmp_path / "Thumbs.db"
+        f.write_text("x")
+        with patch.object(hazel_service, "move_file") as mock_move:
+            hazel_service.process_file(f, make_rule(tmp_path), MagicMock(), skip_readiness=True)
+        mock_move.assert_not_called()
+
+
+class TestSetupDirectories:
+    def test_missing_source_directories_are_created(self, tmp_path):
+        service = HazelService.__new__(HazelService)
+        service.rules = [make_rule(tmp_path / "Downloads", source_directories=[".", "Inbox"])]
+        service._setup_directories()
+        assert (tmp_path / "Downloads" / "Inbox").is_dir()
+        assert (tmp_path / "Downloads" / "tmp").is_dir()
+
+
+class TestProcessExistingFiles:
+    def _service(self, rule):
+        service = HazelService.__new__(HazelService)
+        service.rules = [rule]
+        service.logger = MagicMock()
+        return service
+
+    def test_symlinked_files_are_processed(self, tmp_path):
+        target = tmp_path / "elsewhere" / "a.pdf"
+        target.parent.mkdir()
+        target.write_text("x")
+        watch = tmp_path / "Downloads"
+        watch.mkdir()
+        (watch / "a.pdf").symlink_to(target)
+        (watch / "gone.pdf").symlink_to(tmp_path / "missing.pdf")
+        with patch.object(hazel_service, "process_file") as mock_process:
+            self._service(make_rule(watch))._process_existing_files()
+        processed = [c.args[0] for c in mock_process.call_args_list]
+        assert processed == [watch / "a.pdf"]
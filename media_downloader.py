@@ -1,61 +1,122 @@
 #!/usr/bin/env python3
-import time
+import os
+import re
 import typer
-import requests
+import httpx
 import shlex
+import threading
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlsplit
 from rich import print
-from tqdm import tqdm
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+
+try:
+    import h2  # noqa: F401  (installed by httpx[http2])
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
 
 app = typer.Typer()
 
-def _find_media_url_selenium(page_url: str):
-    """Internal function to find media URL using Selenium."""
+# cURL command parsing
+_BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+_LINE_CONTINUATION_RE = re.compile(r'\\\s*\n\s*')
+_HEADER_FLAGS = frozenset({'-H', '--header'})
+_COOKIE_FLAGS = frozenset({'-b', '--cookie'})
+
+CHROMEDRIVER_PATH_CACHE = Path.home() / ".cache" / "devbinstandards" / "chromedriver_path.txt"
+MEDIA_WAIT_SECONDS = 10
+
+# Media detection runs inside the page so only the answer crosses the
+# WebDriver bridge, instead of every resource the page loaded.
+_IS_MEDIA_ENTRY_JS = r"""
+function isMedia(e) {
+    var ct = e.contentType || '';
+    return ct.indexOf('video') !== -1 || ct.indexOf('audio') !== -1
+        || e.initiatorType === 'media'
+        || /\.(mp4|webm|mkv|avi|mov|flv)(\?|#|$)/i.test(e.name)
+        || (e.initiatorType === 'fetch' && e.name.indexOf('video') !== -1);
+}
+"""
+
+# The last media request is usually the most relevant, so scan backwards and
+# stop at the first hit.
+_LAST_MEDIA_URL_JS = _IS_MEDIA_ENTRY_JS + r"""
+var entries = window.performance.getEntries();
+for (var i = entries.length - 1; i >= 0; i--) {
+    if (isMedia(entries[i])) return entries[i].name;
+}
+return null;
+"""
+
+_chromedriver_lock = threading.Lock()
+
+def _chromedriver_path(refresh: bool = False) -> str:
+    """Return the chromedriver binary path, calling ChromeDriverManager only on a cache miss."""
+    with _chromedriver_lock:  # batch workers would otherwise race to install
+        return _locked_chromedriver_path(refresh)
+
+def _locked_chromedriver_path(refresh: bool) -> str:
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    if not refresh:
+        try:
+            cached = CHROMEDRIVER_PATH_CACHE.read_text().strip()
+            if cached and os.path.exists(cached):
+                return cached
+        except OSError:
+            pass
+    path = ChromeDriverManager().install()
+    try:
+        CHROMEDRIVER_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        CHROMEDRIVER_PATH_CACHE.write_text(path)
+    except OSError:
+        pass  # caching is best effort
+    return path
+
+def _new_driver(remote_url: Optional[str] = None):
+    """Start a headless Chrome session, locally or on a Selenium server at remote_url."""
+    from selenium import webdriver
+    from selenium.common.exceptions import SessionNotCreatedException
+    from selenium.webdriver.chrome.service import Service
+
     print("[bold cyan]Setting up headless browser...[/bold cyan]")
     options = webdriver.ChromeOptions()
     options.add_argument('--headless')
     options.add_argument('--no-sandbox')
     options.add_argument('--disable-dev-shm-usage')
-    
-    driver = None
+    if remote_url:
+        # e.g. a selenium/standalone-chrome container on http://localhost:4444/wd/hub
+        return webdriver.Remote(command_executor=remote_url, options=options)
+    try:
+        return webdriver.Chrome(service=Service(_chromedriver_path()), options=options)
+    except SessionNotCreatedException:
+        # Chrome updated since the driver path was cached; fetch a matching driver
+        return webdriver.Chrome(service=Service(_chromedriver_path(refresh=True)), options=options)
+
+def _find_media_url(driver, page_url: str):
+    """Find the media URL on page_url using an already running driver."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+
     try:
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        
         print(f"[cyan]Navigating to {page_url}...[/cyan]")
         driver.get(page_url)
         
-        print("[cyan]Waiting for page to load and media to start playing (10s)...[/cyan]")
-        time.sleep(10)
-        
-        print("[cyan]Inspecting network requests for media files...[/cyan]")
-        performance_entries = driver.execute_script("return window.performance.getEntries()")
-        
-        media_urls = []
-        for entry in performance_entries:
-            # More robust check for media files
-            initiator_type = entry.get('initiatorType', '')
-            content_type = entry.get('contentType', '')
-            name = entry.get('name', '')
-            
-            is_media = False
-            if 'video' in content_type or 'audio' in content_type:
-                is_media = True
-            elif name.endswith(('.mp4', '.webm', '.mkv', '.avi', '.mov', '.flv')):
-                is_media = True
-            elif initiator_type == 'fetch' and 'video' in name:
-                is_media = True
-
-            if is_media:
-                media_urls.append(name)
-        
-        if media_urls:
-            # Return the last one found, often the most relevant
-            return media_urls[-1]
+        print(f"[cyan]Waiting for a media request (up to {MEDIA_WAIT_SECONDS}s)...[/cyan]")
+        try:
+            # Poll the page's network entries and return as soon as one looks like media
+            return WebDriverWait(driver, MEDIA_WAIT_SECONDS, poll_frequency=0.25).until(
+                lambda d: d.execute_script(_LAST_MEDIA_URL_JS)
+            )
+        except TimeoutException:
+            pass
 
         print("[yellow]No media requests found. Falling back to video tags...[/yellow]")
-        video_elements = driver.find_elements("tag name", "video")
+        video_elements = driver.find_elements(By.TAG_NAME, "video")
         if video_elements:
             src = video_elements[0].get_attribute('src')
             if src:
@@ -66,39 +127,204 @@ def _find_media_url_selenium(page_url: str):
     except Exception as e:
         print(f"[bold red]An error occurred: {e}[/bold red]")
         return None
+
+def _find_media_url_selenium(page_url: str):
+    """Internal function to find media URL using Selenium."""
+    return _find_media_urls_selenium([page_url])[0]
+
+def _find_media_urls_selenium(page_urls: list, workers: int = 1, remote_url: Optional[str] = None) -> list:
+    """Find the media URL for each page, in order.
+
+    The pages are dealt round-robin to ``workers`` browser sessions that run
+    in parallel; each session is reused for all of its pages.
+    """
+    workers = max(1, min(workers, len(page_urls)))
+    if workers == 1:
+        return _find_media_urls_in_session(page_urls, remote_url)
+
+    shares = [page_urls[i::workers] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda share: _find_media_urls_in_session(share, remote_url), shares))
+    media_urls = [None] * len(page_urls)
+    for i, share_results in enumerate(results):
+        media_urls[i::workers] = share_results
+    return media_urls
+
+def _find_media_urls_in_session(page_urls: list, remote_url: Optional[str] = None) -> list:
+    """Find the media URL for each page, reusing a single browser session."""
+    driver = None
+    try:
+        driver = _new_driver(remote_url)
+        return [_find_media_url(driver, page_url) for page_url in page_urls]
+    except Exception as e:
+        print(f"[bold red]An error occurred: {e}[/bold red]")
+        return [None] * len(page_urls)
     finally:
         if driver:
             driver.quit()
         print("[bold cyan]Browser session closed.[/bold cyan]")
 
+DOWNLOAD_DIR = "/Users/jadennation/Downloads/drive/vid"
+CHUNK_SIZE = 1 << 20
+RANGE_SEGMENTS = 8
+MIN_RANGE_SIZE = 8 << 20  # below this, one stream is as fast as eight
+
+# One client for the whole process so the probe and every range segment share
+# a connection pool (and, with HTTP/2, a single multiplexed TLS connection).
+_http = httpx.Client(http2=_HTTP2, timeout=httpx.Timeout(60.0, connect=10.0), follow_redirects=True)
+
+
+def _range_total(response) -> int:
+    """Total size from a 206 ``Content-Range: bytes lo-hi/total`` header, or 0."""
+    total = response.headers.get('content-range', '').rpartition('/')[2]
+    return int(total) if total.isdigit() else 0
+
+
+def _preallocate(fd: int, size: int):
+    """Reserve size bytes for fd up front so segment writes never extend the file.
+
+    posix_fallocate allocates real blocks on Linux; macOS has no equivalent in
+    the os module, so fall back to a (sparse) ftruncate there.
+    """
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            pass  # e.g. EOPNOTSUPP on some network filesystems
+    os.ftruncate(fd, size)
+
+
+def _progress_bar(total_size: int, filename: str):
+    """A download progress bar that redraws at most four times a second."""
+    from tqdm import tqdm
+
+    return tqdm(
+        total=total_size, unit='iB', unit_scale=True, desc=filename, colour="green",
+        mininterval=0.25,
+    )
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int):
+    """pwrite all of data at offset; a single pwrite may write fewer bytes."""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+@contextmanager
+def _partial_file(filename: str):
+    """Yield a ``.part`` path that becomes filename only if the body completes.
+
+    On any error the part file is removed, so a preallocated, zero-filled file
+    is never left behind looking like a finished download.
+    """
+    part = filename + '.part'
+    try:
+        yield part
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(part)
+        raise
+    os.replace(part, filename)
+
+
+def _fetch_range(url: str, headers: dict, fd: int, lo: int, hi: int, pbar, abort: threading.Event):
+    """Download bytes lo..hi (inclusive) and write them at the same offset in fd.
+
+    Returns early once abort is set, i.e. another segment has failed.
+    """
+    range_headers = {**headers, 'Range': f'bytes={lo}-{hi}', 'Accept-Encoding': 'identity'}
+    with _http.stream('GET', url, headers=range_headers) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise httpx.HTTPError(f"Server ignored range request for bytes {lo}-{hi}")
+        offset = lo
+        for data in response.iter_bytes(CHUNK_SIZE):
+            if abort.is_set():
+                return
+            _pwrite_all(fd, data, offset)
+            offset += len(data)
+            pbar.update(len(data))
+
+
+def _download_ranges(url: str, headers: dict, filename: str, total_size: int):
+    """Download total_size bytes as RANGE_SEGMENTS parallel range requests."""
+    segment = -(-total_size // RANGE_SEGMENTS)
+    abort = threading.Event()
+    with _partial_file(filename) as part:
+        fd = os.open(part, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            _preallocate(fd, total_size)
+            with _progress_bar(total_size, filename) as pbar, ThreadPoolExecutor(max_workers=RANGE_SEGMENTS) as pool:
+                futures = [
+                    pool.submit(_fetch_range, url, headers, fd, lo, min(lo + segment, total_size) - 1, pbar, abort)
+                    for lo in range(0, total_size, segment)
+                ]
+                try:
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    # Drop queued segments and stop running ones before the pool joins them
+                    abort.set()
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            os.close(fd)
+
+
+def _download_stream(response, filename: str):
+    """Write a streaming response to filename sequentially."""
+    total_size = int(response.headers.get('content-length', 0))
+    # A buffered writer retries short writes; 1 MiB chunks bypass its buffer anyway.
+    with _partial_file(filename) as part, open(part, 'wb') as f, \
+            _progress_bar(total_size, filename) as pbar:
+        if total_size:
+            _preallocate(f.fileno(), total_size)
+        for data in response.iter_bytes(CHUNK_SIZE):
+            f.write(data)
+            pbar.update(len(data))
+        f.truncate()  # drop any reserved tail if the body was shorter than advertised
+
+
 def _download_file(url: str, headers: dict):
-    """Internal function to download a file with optional headers."""
+    """Internal function to download a file with optional headers.
+
+    Large files on servers that honour ``Range`` are fetched as parallel
+    segments; everything else falls back to a single streaming GET.
+    """
     if not url:
         print("[bold red]No URL provided.[/bold red]")
         return
 
     try:
-        response = requests.get(url, headers=headers, stream=True)
-        response.raise_for_status()
-        
-        total_size = int(response.headers.get('content-length', 0))
-        block_size = 1024
-        
-        import os
-        download_dir = "/Users/jadennation/Downloads/drive/vid"
-        os.makedirs(download_dir, exist_ok=True)
-        filename = os.path.join(download_dir, url.split('/')[-1].split('?')[0]) # Clean filename
-        
-        with open(filename, 'wb') as f, tqdm(
-            total=total_size, unit='iB', unit_scale=True, desc=filename, colour="green"
-        ) as pbar:
-            for data in response.iter_content(block_size):
-                f.write(data)
-                pbar.update(len(data))
-                
+        os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+        filename = os.path.join(DOWNLOAD_DIR, urlsplit(url).path.rsplit('/', 1)[-1] or 'download.bin') # Clean filename
+
+        # Probe with a one-byte range: a 206 tells us the size and that
+        # ranges work, a 200 is the whole file and we just stream it.
+        probe = _http.send(_http.build_request('GET', url, headers={**headers, 'Range': 'bytes=0-0'}), stream=True)
+        try:
+            probe.raise_for_status()
+            total_size = _range_total(probe) if probe.status_code == 206 else 0
+            if probe.status_code == 200:
+                _download_stream(probe, filename)
+        finally:
+            probe.close()
+
+        if total_size >= MIN_RANGE_SIZE:
+            _download_ranges(url, headers, filename, total_size)
+        elif probe.status_code == 206:
+            with _http.stream('GET', url, headers=headers) as response:
+                response.raise_for_status()
+                _download_stream(response, filename)
+
         print(f"[bold green]Downloaded {filename}[/bold green]")
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"[bold red]An error occurred during download: {e}[/bold red]")
 
 @app.command()
@@ -112,6 +338,22 @@ def find(page_url: str):
     else:
         print("[bold red]Could not find a media URL on the page.[/bold red]")
 
+@app.command()
+def find_batch(
+    page_urls: List[str],
+    workers: int = typer.Option(1, "--workers", "-w", help="Number of browser sessions to run in parallel."),
+    remote: Optional[str] = typer.Option(None, "--remote", help="Selenium server URL (e.g. a selenium/standalone-chrome container at http://localhost:4444/wd/hub) instead of local Chrome."),
+):
+    """
+    Finds media URLs for several webpages, reusing each browser session across pages.
+    """
+    media_urls = _find_media_urls_selenium(page_urls, workers=workers, remote_url=remote)
+    for page_url, media_url in zip(page_urls, media_urls):
+        if media_url:
+            print(f"[bold green]{page_url}:[/] {media_url}")
+        else:
+            print(f"[bold red]{page_url}: no media URL found.[/bold red]")
+
 @app.command()
 def download(media_url: str):
     """
@@ -119,12 +361,29 @@ def download(media_url: str):
     """
     _download_file(media_url, headers={})
 
+def _parse_curl_tokens(tokens: list) -> tuple:
+    """Extract the URL and request headers from a tokenized cURL command in one pass."""
+    url = None
+    headers = {}
+    it = iter(tokens)
+    for tok in it:
+        if tok in _HEADER_FLAGS:
+            key, sep, value = next(it, '').partition(':')
+            if sep:
+                headers[key.strip()] = value.strip()
+        elif tok in _COOKIE_FLAGS:
+            headers['Cookie'] = next(it, '')
+        elif tok == '--url':
+            url = next(it, None)
+        elif url is None and tok.startswith(('http://', 'https://')):
+            url = tok
+    return url, headers
+
 @app.command(context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
 def curl(ctx: typer.Context, file_path: str = typer.Option(None, "--file", "-f", help="Path to a file containing multiple curl commands, one per line.")):
     """
     Parses a raw cURL command and downloads the media.
     """
-    import re
     print("[cyan]Parsing cURL command...[/cyan]")
     
     commands_to_process = []
@@ -133,86 +392,40 @@ def curl(ctx: typer.Context, file_path: str = typer.Option(None, "--file", "-f",
             with open(file_path, 'r') as f:
                 file_content = f.read()
                 # Split content by one or more blank lines to get individual curl command blocks
-                raw_command_blocks = re.split(r'\n\s*\n+', file_content.strip())
+                raw_command_blocks = _BLANK_LINES_RE.split(file_content.strip())
                 
                 for block in raw_command_blocks:
                     # For each block, remove line continuation backslashes and newlines
                     # to form a single-line curl command
-                    single_line_cmd = re.sub(r'\\\s*\n\s*', ' ', block).strip()
+                    single_line_cmd = _LINE_CONTINUATION_RE.sub(' ', block).strip()
                     if single_line_cmd: # Ensure it's not an empty string
-                        commands_to_process.append(single_line_cmd)
+                        try:
+                            commands_to_process.append(shlex.split(single_line_cmd))
+                        except ValueError as e:
+                            print(f"[bold red]Skipping malformed command ({e}):[/bold red] {single_line_cmd[:100]}")
                 
         except FileNotFoundError:
             print(f"[bold red]Error: File not found at {file_path}[/bold red]")
             return
     else:
-        commands_to_process = [" ".join(ctx.args)]
+        # The shell has already tokenized the arguments for us
+        commands_to_process = [list(ctx.args)]
 
-    for curl_command in commands_to_process:
-        if not curl_command.strip():
+    for tokens in commands_to_process:
+        if not tokens:
             continue
 
-        print(f"[bold blue]Processing command:[/bold blue] {curl_command[:100]}...") # Show a snippet of the command
-        
-        # Improved parsing logic using regular expressions
-        # This is more robust to handle various quoting styles.
-        
-        url = None
-        headers = {}
-
-        # Extract URL first - it's typically the first non-option argument
-        # This regex looks for 'curl' followed by an optional quoted string.
-        url_match = re.search(r"curl\s+'([^']+)'", curl_command)
-        if url_match:
-            url = url_match.group(1)
-        else:
-            # Fallback for double quotes
-            url_match = re.search(r'curl\s+"([^"]+)"', curl_command)
-            if url_match:
-                url = url_match.group(1)
+        print(f"[bold blue]Processing command:[/bold blue] {shlex.join(tokens)[:100]}...") # Show a snippet of the command
 
-        if not url:
-            # Fallback for unquoted URL
-            parts = shlex.split(curl_command)
-            if len(parts) > 1 and parts[0] == 'curl':
-                if parts[1].startswith('http'):
-                    url = parts[1]
-
-        if not url:
-            # Last resort: find the first http URL in the command
-            url_match = re.search(r"https?://[^\s'\"_]+", curl_command)
-            if url_match:
-                url = url_match.group(0)
+        url, headers = _parse_curl_tokens(tokens)
 
         if not url:
             print("[bold red]Could not extract URL from curl command.[/bold red]")
             return
 
-        # Extract headers, supporting both single and double quotes
-        header_matches = re.findall(r"-H\s+'([^']+)'", curl_command)
-        for header in header_matches:
-            if ': ' in header:
-                key, value = header.split(': ', 1)
-                headers[key.strip()] = value.strip()
-
-        header_matches_double = re.findall(r'-H\s+"([^"]+)"', curl_command)
-        for header in header_matches_double:
-            if ': ' in header:
-                key, value = header.split(': ', 1)
-                headers[key.strip()] = value.strip()
-
-        # Extract cookies from -b
-        cookie_match = re.search(r"-b\s+'([^']+)'", curl_command)
-        if cookie_match:
-            headers['Cookie'] = cookie_match.group(1)
-        else:
-            cookie_match = re.search(r'-b\s+"([^"]+)"', curl_command)
-            if cookie_match:
-                headers['Cookie'] = cookie_match.group(1)
-            
         # Remove range header to ensure we download the full file
-        if 'range' in headers:
-            headers.pop('range')
+        for key in [k for k in headers if k.lower() == 'range']:
+            headers.pop(key)
             print("[yellow]Removed 'range' header to download the full file.[/yellow]")
 
         print(f"[cyan]Extracted URL:[/] {url}")
@@ -5,20 +5,24 @@ A command-line interface for the Kagi Search API, providing access to
 Search, FastGPT, Universal Summarizer, and Enrichment APIs.
 """
 
+import asyncio
 import os
-import json
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Literal
+from typing import List, Optional, Literal, Union
 
 import httpx
+import orjson
 import typer
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
 from rich.tree import Tree
 
+from env_refs import load_env_value
+
 app = typer.Typer(help="Kagi Search API Wrapper")
 console = Console()
 
@@ -59,36 +63,44 @@ class EnrichResponse(BaseModel):
 
 # --- Client ---
 
+BASE_URL = "https://kagi.com/api/v0"
+BATCH_CONCURRENCY = 8
+
+
+def _client_options(api_key: str) -> dict:
+    # One pooled HTTP/2 connection carries every call made through a client
+    return dict(
+        base_url=BASE_URL,
+        http2=True,
+        timeout=60.0,
+        limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=30.0),
+        headers={"Authorization": f"Bot {api_key}"},
+    )
+
+
+def _fastgpt_body(query: str, cache: bool) -> dict:
+    return {"query": query, "cache": "true" if cache else "false"}
+
+
 class KagiClient:
-    BASE_URL = "https://kagi.com/api/v0"
+    BASE_URL = BASE_URL
 
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.client = httpx.Client(timeout=60.0)
-
-    def _get_headers(self):
-        return {
-            "Authorization": f"Bot {self.api_key}",
-        }
+        self.client = httpx.Client(**_client_options(api_key))
 
     def search(self, query: str, limit: int = 10) -> SearchResponse:
         params = {"q": query, "limit": limit}
         response = self.client.get(
-            f"{self.BASE_URL}/search", headers=self._get_headers(), params=params
+            "/search", params=params
         )
-        return SearchResponse(**response.json())
+        return SearchResponse.model_validate_json(response.content)
 
     def fastgpt(self, query: str, cache: bool = True) -> FastGPTResponse:
-        data = {"query": query}
-        if cache:
-            data["cache"] = "true"
-        else:
-            data["cache"] = "false"
-            
         response = self.client.post(
-            f"{self.BASE_URL}/fastgpt", headers=self._get_headers(), json=data
+            "/fastgpt", json=_fastgpt_body(query, cache)
         )
-        return FastGPTResponse(**response.json())
+        return FastGPTResponse.model_validate_json(response.content)
 
     def summarize(
         self,
@@ -114,27 +126,133 @@ class KagiClient:
         
         # The official client uses GET for summarize
         response = self.client.get(
-            f"{self.BASE_URL}/summarize", headers=self._get_headers(), params=params
+            "/summarize", params=params
         )
-        return SummarizeResponse(**response.json())
+        return SummarizeResponse.model_validate_json(response.content)
 
     def enrich_web(self, query: str) -> EnrichResponse:
         params = {"q": query}
         response = self.client.get(
-            f"{self.BASE_URL}/enrich/web", headers=self._get_headers(), params=params
+            "/enrich/web", params=params
         )
-        return EnrichResponse(**response.json())
+        return EnrichResponse.model_validate_json(response.content)
     
     def enrich_news(self, query: str) -> EnrichResponse:
         params = {"q": query}
         response = self.client.get(
-            f"{self.BASE_URL}/enrich/news", headers=self._get_headers(), params=params
+            "/enrich/news", params=params
+        )
+        return EnrichResponse.model_validate_json(response.content)
+
+
+class AsyncKagiClient:
+    """Runs many requests of one kind concurrently over a single HTTP/2 connection."""
+
+    def __init__(self, api_key: str, concurrency: int = BATCH_CONCURRENCY):
+        self.client = httpx.AsyncClient(**_client_options(api_key))
+        self._slots = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+
+    async def _request(self, model, method: str, path: str, **kwargs) -> Union[BaseModel, Exception]:
+        """One batch entry: the parsed model, or the exception standing in for it.
+
+        Failures are returned rather than raised so one bad query never cancels
+        the rest of the batch.
+        """
+        try:
+            async with self._slots:
+                response = await self.client.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            return e
+        try:
+            return model.model_validate_json(response.content)
+        except ValidationError as e:
+            if response.is_error:
+                # Not one of Kagi's JSON error bodies, e.g. a proxy's 502 HTML page
+                return httpx.HTTPStatusError(
+                    f"HTTP {response.status_code} {response.reason_phrase}",
+                    request=response.request,
+                    response=response,
+                )
+            return e
+
+    async def _gather(self, model, requests: List[tuple]) -> list:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(self._request(model, method, path, **kwargs)) for method, path, kwargs in requests]
+        return [task.result() for task in tasks]
+
+    async def search(self, queries: List[str], limit: int = 10) -> List[Union[SearchResponse, Exception]]:
+        return await self._gather(
+            SearchResponse, [("GET", "/search", {"params": {"q": q, "limit": limit}}) for q in queries]
+        )
+
+    async def fastgpt(self, queries: List[str], cache: bool = True) -> List[Union[FastGPTResponse, Exception]]:
+        return await self._gather(
+            FastGPTResponse, [("POST", "/fastgpt", {"json": _fastgpt_body(q, cache)}) for q in queries]
+        )
+
+    async def enrich(self, queries: List[str], kind: str = "web") -> List[Union[EnrichResponse, Exception]]:
+        return await self._gather(
+            EnrichResponse, [("GET", f"/enrich/{kind}", {"params": {"q": q}}) for q in queries]
         )
-        return EnrichResponse(**response.json())
 
 
 # --- Helpers ---
 
+def _print_json(response: BaseModel):
+    # print_json re-indents the document itself, so emit it compact
+    console.print_json(orjson.dumps(response.model_dump()).decode())
+
+
+@lru_cache(maxsize=None)
+def _dotenv_api_key() -> Optional[str]:
+    """Read KAGI_API_KEY from the .env next to this file, once per process."""
+    return load_env_value(Path(__file__).resolve().parent, "KAGI_API_KEY")
+
+
+def read_queries(path: Path) -> List[str]:
+    """One query per line; blank lines are ignored."""
+    return [line.strip() for line in path.read_text().splitlines() if line.strip()]
+
+
+def run_batch(api_key: Optional[str], call) -> list:
+    """Run ``call(AsyncKagiClient)`` to completion and return its result."""
+    async def _run():
+        async with AsyncKagiClient(get_api_key(api_key)) as client:
+            return await call(client)
+    return asyncio.run(_run())
+
+
+def render_batch(queries: List[str], responses: list, render, rules: bool = False) -> bool:
+    """Render each query's batch result, reporting failed queries in place.
+
+    Returns False if any query failed.
+    """
+    ok = True
+    for query, response in zip(queries, responses):
+        if rules:
+            console.rule(query)
+        if isinstance(response, Exception):
+            console.print(f"[red]Error for {query!r}: {response}[/red]")
+            ok = False
+        else:
+            render(query, response)
+    return ok
+
+
+def print_api_errors(response) -> bool:
+    if not response.error:
+        return False
+    for err in response.error:
+        console.print(f"[red]API Error ({err.get('code')}): {err.get('msg')}[/red]")
+    return True
+
+
 def get_api_key(api_key: Optional[str] = None) -> str:
     if api_key:
         return api_key
@@ -144,24 +262,87 @@ def get_api_key(api_key: Optional[str] = None) -> str:
     if env_key:
         return env_key
 
-    # Try loading from .env similarly to tavilySearch
-    project_dir = Path(__file__).parent
-    try:
-        import subprocess
-        result = subprocess.run(
-            ["zsh", "-c", "unset KAGI_API_KEY; source $HOME/DEV/bin/autoload_environment.zsh; loadenv_verbose_masked .env >/dev/null 2>&1; echo $KAGI_API_KEY"],
-            capture_output=True,
-            text=True,
-            cwd=project_dir
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            return result.stdout.strip().split('\n')[-1].strip()
-    except Exception:
-        pass
+    # Fall back to the project's .env, resolved the same way loadenv does
+    env_key = _dotenv_api_key()
+    if env_key:
+        return env_key
 
     raise ValueError("API key must be provided via --api-key or KAGI_API_KEY environment variable")
 
 
+# --- Rendering ---
+
+def render_search(query: str, response: SearchResponse, format: str):
+    if print_api_errors(response):
+        return
+
+    if format == "json":
+        _print_json(response)
+    elif format == "table":
+        if response.data:
+            # Build the whole listing first so Rich renders and writes it once
+            lines = []
+            for i, result in enumerate(response.data, 1):
+                lines.append(f"\n[bold]{i}. {result.title or 'No Title'}[/bold]")
+                lines.append(f"   [blue]{result.url or 'No URL'}[/blue]")
+                if result.snippet:
+                    lines.append(f"   [dim]{result.snippet}[/dim]")
+            console.print("\n".join(lines))
+        if not response.data and not response.error:
+             console.print("[yellow]No results found.[/yellow]")
+
+    elif format == "tree":
+        tree = Tree(f"[bold cyan]Search Results for: {query}[/bold cyan]")
+        if response.data:
+            for result in response.data:
+                branch = tree.add(f"[bold]{result.title or 'No Title'}[/bold]")
+                branch.add(f"[blue]{result.url or 'No URL'}[/blue]")
+                if result.snippet:
+                    branch.add(f"[green]{result.snippet}[/green]")
+        console.print(tree)
+
+
+def render_fastgpt(query: str, response: FastGPTResponse, format: str):
+    if print_api_errors(response):
+        return
+
+    if format == "json":
+        _print_json(response)
+    else:
+        if response.data:
+            output = response.data.get("output", "")
+            console.print(Panel.fit(Text(output), title=f"FastGPT Answer: {query}"))
+            
+            refs = response.data.get("references", [])
+            if refs:
+                lines = ["\n[bold]References:[/bold]"]
+                lines.extend(f"- {ref.get('title', 'Unknown')} ({ref.get('url', 'No URL')})" for ref in refs)
+                console.print("\n".join(lines))
+        elif not response.error:
+            console.print("[yellow]No answer returned.[/yellow]")
+
+
+def render_enrich(query: str, kind: str, response: EnrichResponse, format: str):
+    if print_api_errors(response):
+        return
+
+    if format == "json":
+        _print_json(response)
+    else:
+        table = Table(title=f"Enrichment Results ({kind}): {query}", show_lines=False)
+        table.add_column("Type", style="dim", width=4)
+        table.add_column("Title", style="bold cyan")
+        table.add_column("URL", style="blue")
+        
+        # Structure might vary slightly, adapting generally
+        for item in response.data or ():
+            table.add_row(str(item.get("t", "?")), item.get("title", "No Title"), item.get("url", "No URL"))
+        
+        console.print(table)
+        if not response.data and not response.error:
+             console.print("[yellow]No results found.[/yellow]")
+
+
 # --- Commands ---
 
 @app.command()
@@ -191,32 +372,7 @@ def search(
         client = KagiClient(key)
         response = client.search(query, limit)
 
-        if response.error:
-            for err in response.error:
-                console.print(f"[red]API Error ({err.get('code')}): {err.get('msg')}[/red]")
-            return
-
-        if format == "json":
-            console.print_json(json.dumps(response.model_dump(), indent=2))
-        elif format == "table":
-            if response.data:
-                for i, result in enumerate(response.data, 1):
-                    console.print(f"\n[bold]{i}. {result.title or 'No Title'}[/bold]")
-                    console.print(f"   [blue]{result.url or 'No URL'}[/blue]")
-                    if result.snippet:
-                        console.print(f"   [dim]{result.snippet}[/dim]")
-            if not response.data and not response.error:
-                 console.print("[yellow]No results found.[/yellow]")
-
-        elif format == "tree":
-            tree = Tree(f"[bold cyan]Search Results for: {query}[/bold cyan]")
-            if response.data:
-                for result in response.data:
-                    branch = tree.add(f"[bold]{result.title or 'No Title'}[/bold]")
-                    branch.add(f"[blue]{result.url or 'No URL'}[/blue]")
-                    if result.snippet:
-                        branch.add(f"[green]{result.snippet}[/green]")
-            console.print(tree)
+        render_search(query, response, format)
 
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -250,25 +406,7 @@ def fastgpt(
         client = KagiClient(key)
         response = client.fastgpt(query, cache)
 
-        if response.error:
-            for err in response.error:
-                console.print(f"[red]API Error ({err.get('code')}): {err.get('msg')}[/red]")
-            return
-
-        if format == "json":
-            console.print_json(json.dumps(response.model_dump(), indent=2))
-        else:
-            if response.data:
-                output = response.data.get("output", "")
-                console.print(Panel.fit(Text(output), title=f"FastGPT Answer: {query}"))
-                
-                refs = response.data.get("references", [])
-                if refs:
-                    console.print("\n[bold]References:[/bold]")
-                    for ref in refs:
-                        console.print(f"- {ref.get('title', 'Unknown')} ({ref.get('url', 'No URL')})")
-            elif not response.error:
-                console.print("[yellow]No answer returned.[/yellow]")
+        render_fastgpt(query, response, format)
 
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
@@ -305,13 +443,11 @@ def summarize(
             cache=cache
         )
 
-        if response.error:
-            for err in response.error:
-                console.print(f"[red]API Error ({err.get('code')}): {err.get('msg')}[/red]")
+        if print_api_errors(response):
             return
 
         if format == "json":
-            console.print_json(json.dumps(response.model_dump(), indent=2))
+            _print_json(response)
         else:
             if response.data:
                 output = response.data.get("output", "")
@@ -358,34 +494,78 @@ def enrich(
             console.print(f"[red]Unknown enrichment kind: {kind}[/red]")
             raise typer.Exit(1)
 
-        if response.error:
-            for err in response.error:
-                console.print(f"[red]API Error ({err.get('code')}): {err.get('msg')}[/red]")
-            return
+        render_enrich(query, kind, response, format)
+
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
 
-        if format == "json":
-            console.print_json(json.dumps(response.model_dump(), indent=2))
-        else:
-            table = Table(title=f"Enrichment Results ({kind}): {query}")
-            table.add_column("Type", style="dim", width=4)
-            table.add_column("Title", style="bold cyan")
-            table.add_column("URL", style="blue")
-            
-            if response.data:
-                for item in response.data:
-                    # Structure might vary slightly, adapting generally
-                    rank = item.get("t", "?")
-                    title = item.get("title", "No Title")
-                    url = item.get("url", "No URL")
-                    table.add_row(str(rank), title, url)
-            
-            console.print(table)
-            if not response.data and not response.error:
-                 console.print("[yellow]No results found.[/yellow]")
 
+@app.command("search-batch")
+def search_batch(
+    queries_file: Path = typer.Option(..., "--queries-file", help="File with one query per line"),
+    limit: int = typer.Option(10, "--limit", help="Number of results"),
+    api_key: Optional[str] = typer.Option(None, "--api-key", help="Kagi API key"),
+    format: str = typer.Option("table", "--format", help="Output format: json, table, tree"),
+):
+    """
+    Run many searches concurrently.
+    """
+    try:
+        queries = read_queries(queries_file)
+        responses = run_batch(api_key, lambda client: client.search(queries, limit))
+        ok = render_batch(queries, responses, lambda q, r: render_search(q, r, format), rules=True)
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
         raise typer.Exit(1)
+    if not ok:
+        raise typer.Exit(1)
+
+
+@app.command("fastgpt-batch")
+def fastgpt_batch(
+    queries_file: Path = typer.Option(..., "--queries-file", help="File with one query per line"),
+    cache: bool = typer.Option(True, "--cache/--no-cache", help="Use cache"),
+    api_key: Optional[str] = typer.Option(None, "--api-key", help="Kagi API key"),
+    format: str = typer.Option("panel", "--format", help="Output format: json, panel"),
+):
+    """
+    Answer many queries concurrently using FastGPT.
+    """
+    try:
+        queries = read_queries(queries_file)
+        responses = run_batch(api_key, lambda client: client.fastgpt(queries, cache))
+        ok = render_batch(queries, responses, lambda q, r: render_fastgpt(q, r, format))
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    if not ok:
+        raise typer.Exit(1)
+
+
+@app.command("enrich-batch")
+def enrich_batch(
+    queries_file: Path = typer.Option(..., "--queries-file", help="File with one query per line"),
+    kind: str = typer.Option("web", "--kind", help="Type of enrichment: web or news"),
+    api_key: Optional[str] = typer.Option(None, "--api-key", help="Kagi API key"),
+    format: str = typer.Option("table", "--format", help="Output format: json, table"),
+):
+    """
+    Get enriched content results for many queries concurrently.
+    """
+    if kind not in ("web", "news"):
+        console.print(f"[red]Unknown enrichment kind: {kind}[/red]")
+        raise typer.Exit(1)
+
+    try:
+        queries = read_queries(queries_file)
+        responses = run_batch(api_key, lambda client: client.enrich(queries, kind))
+        ok = render_batch(queries, responses, lambda q, r: render_enrich(q, kind, r, format))
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    if not ok:
+        raise typer.Exit(1)
 
 
 if __name__ == "__main__":
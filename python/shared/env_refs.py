@@ -0,0 +1,68 @@
+"""
+Resolve .env values the way autoload_environment.zsh does.
+
+This is the single copy shared by the python CLIs: python/kagi/env_refs.py and
+python/tavilySearch/env_refs.py are symlinks to this file, so each project
+still ships it inside its own wheel.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from dotenv import dotenv_values
+
+# How far up DEFER_PARENT looks for a parent .env, as in autoload_environment.zsh
+DEFER_PARENT_MAX_DEPTH = 5
+
+
+def resolve_env_value(key: str, val: Optional[str], env_dir: Path) -> Optional[str]:
+    """Resolve a .env value the way autoload_environment.zsh's _resolve_env_value does.
+
+    A leading backslash escapes the value; ``REF:/path/to/.env:KEY`` reads KEY
+    from another .env file under $HOME; ``DEFER_PARENT`` takes ``key`` from the
+    nearest parent directory's .env (at most five levels up, stopping at $HOME);
+    ``${command}`` is replaced by the command's output. A reference that cannot
+    be resolved raises ValueError instead of leaking the placeholder as a value.
+    """
+    if not val:
+        return None
+    if val.startswith("\\"):
+        return val[1:]
+    if val.startswith("REF:"):
+        path, _, ref_key = val[len("REF:"):].partition(":")
+        if not (path.startswith("/") and path.startswith(str(Path.home()))):
+            raise ValueError(f"{key}: invalid REF path {path}")
+        if not Path(path).is_file():
+            raise ValueError(f"{key}: referenced .env not found: {path}")
+        resolved = dotenv_values(path, interpolate=False).get(ref_key)
+        if not resolved:
+            raise ValueError(f"{key}: key {ref_key} not found in {path}")
+        return resolved
+    if val == "DEFER_PARENT":
+        home = Path.home().resolve()
+        directory = env_dir
+        for _ in range(DEFER_PARENT_MAX_DEPTH):
+            if directory == home or directory == directory.parent:
+                break
+            directory = directory.parent
+            env_file = directory / ".env"
+            if env_file.is_file():
+                resolved = dotenv_values(env_file, interpolate=False).get(key)
+                if resolved:
+                    # The parent's value may itself be a reference (e.g. another DEFER_PARENT)
+                    return resolve_env_value(key, resolved, directory)
+        raise ValueError(f"{key}: DEFER_PARENT found no value in parent directories of {env_dir}")
+    if val.startswith("${") and val.endswith("}"):
+        import subprocess
+
+        command = val[2:-1]
+        result = subprocess.run(command, shell=True, capture_output=True, text=True, cwd=env_dir)
+        if result.returncode != 0:
+            raise ValueError(f"{key}: command failed: {command}")
+        return result.stdout.rstrip("\n")
+    return val
+
+
+def load_env_value(env_dir: Path, key: str) -> Optional[str]:
+    """Read key from env_dir/.env and resolve it; None if it is unset or empty."""
+    return resolve_env_value(key, dotenv_values(env_dir / ".env", interpolate=False).get(key), env_dir)
@@ -0,0 +1 @@
+../shared/env_refs.py
\ No newline at end of file
@@ -6,47 +6,67 @@ to web search functionality with customizable output formats.
 """
 
 import os
-import json
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import TYPE_CHECKING, List, Optional, Union
 
-import httpx
+import msgspec
 import typer
-from pydantic import BaseModel, Field
 from rich.console import Console
-from rich.table import Table
-from rich.tree import Tree
-from rich.panel import Panel
-from rich.text import Text
+
+from env_refs import load_env_value
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
 
 app = typer.Typer(help="Tavily AI Search API Wrapper")
 console = Console()
 
+CONTENT_PREVIEW_CHARS = 500
+BATCH_CONCURRENCY = 8
+
+_PROJECT_DIR = Path(__file__).resolve().parent
+
+# --include-answer / --include-raw-content values mapped to what the API expects;
+# anything unrecognised falls back to False
+_ANSWER_MODES = {"true": True, "false": False, "basic": "basic", "advanced": "advanced"}
+_RAW_CONTENT_MODES = {"true": True, "false": False, "markdown": "markdown", "text": "text"}
+
+
+@lru_cache(maxsize=None)
+def _search_request_model() -> type["BaseModel"]:
+    """Build the request model on first use so pydantic stays out of --help."""
+    from pydantic import BaseModel, ConfigDict, Field
+
+    class SearchRequest(BaseModel):
+        """Request model for Tavily Search API."""
 
-class SearchRequest(BaseModel):
-    """Request model for Tavily Search API."""
-
-    query: str = Field(..., description="The search query to execute")
-    auto_parameters: bool = Field(default=False, description="Auto-configure parameters")
-    topic: str = Field(default="general", description="Search category: general, news, finance")
-    search_depth: str = Field(default="basic", description="Search depth: basic or advanced")
-    chunks_per_source: int = Field(default=3, ge=1, le=3, description="Chunks per source for advanced search")
-    max_results: int = Field(default=5, ge=0, le=20, description="Maximum results to return")
-    time_range: Optional[str] = Field(default=None, description="Time range: day, week, month, year")
-    start_date: Optional[str] = Field(default=None, description="Start date YYYY-MM-DD")
-    end_date: Optional[str] = Field(default=None, description="End date YYYY-MM-DD")
-    include_answer: Union[bool, str] = Field(default=False, description="Include LLM answer: false, true, basic, advanced")
-    include_raw_content: Union[bool, str] = Field(default=False, description="Include raw content: false, true, markdown, text")
-    include_images: bool = Field(default=False, description="Include image search results")
-    include_image_descriptions: bool = Field(default=False, description="Include image descriptions")
-    include_favicon: bool = Field(default=False, description="Include favicon URLs")
-    include_domains: Optional[List[str]] = Field(default=None, description="Domains to include")
-    exclude_domains: Optional[List[str]] = Field(default=None, description="Domains to exclude")
-    country: Optional[str] = Field(default=None, description="Boost results from country")
-    include_credits: bool = Field(default=False, description="Include credit usage info")
-
-
-class SearchResult(BaseModel):
+        model_config = ConfigDict(frozen=True)
+
+        query: str = Field(..., description="The search query to execute")
+        auto_parameters: bool = Field(default=False, description="Auto-configure parameters")
+        topic: str = Field(default="general", description="Search category: general, news, finance")
+        search_depth: str = Field(default="basic", description="Search depth: basic or advanced")
+        chunks_per_source: int = Field(default=3, ge=1, le=3, description="Chunks per source for advanced search")
+        max_results: int = Field(default=5, ge=0, le=20, description="Maximum results to return")
+        time_range: Optional[str] = Field(default=None, description="Time range: day, week, month, year")
+        start_date: Optional[str] = Field(default=None, description="Start date YYYY-MM-DD")
+        end_date: Optional[str] = Field(default=None, description="End date YYYY-MM-DD")
+        include_answer: Union[bool, str] = Field(default=False, description="Include LLM answer: false, true, basic, advanced")
+        include_raw_content: Union[bool, str] = Field(default=False, description="Include raw content: false, true, markdown, text")
+        include_images: bool = Field(default=False, description="Include image search results")
+        include_image_descriptions: bool = Field(default=False, description="Include image descriptions")
+        include_favicon: bool = Field(default=False, description="Include favicon URLs")
+        include_domains: Optional[List[str]] = Field(default=None, description="Domains to include")
+        exclude_domains: Optional[List[str]] = Field(default=None, description="Domains to exclude")
+        country: Optional[str] = Field(default=None, description="Boost results from country")
+        include_credits: bool = Field(default=False, description="Include credit usage info")
+
+    return SearchRequest
+
+
+class SearchResult(msgspec.Struct, frozen=True):
     """Model for individual search result."""
 
     title: str
@@ -57,12 +77,12 @@ class SearchResult(BaseModel):
     favicon: Optional[str] = None
 
 
-class SearchResponse(BaseModel):
+class SearchResponse(msgspec.Struct, frozen=True, kw_only=True):
     """Response model from Tavily Search API."""
 
     query: str
     answer: Optional[str] = None
-    images: List[dict] = Field(default_factory=list)
+    images: List[dict] = msgspec.field(default_factory=list)
     results: List[SearchResult]
     response_time: float
     auto_parameters: Optional[dict] = None
@@ -70,50 +90,167 @@ class SearchResponse(BaseModel):
     request_id: Optional[str] = None
 
 
+# Parses the response body straight into SearchResponse in one C pass. Lax mode
+# coerces numbers sent as strings (e.g. "0.83") the way the pydantic models did.
+_RESPONSE_DECODER = msgspec.json.Decoder(SearchResponse, strict=False)
+
+
+def _client_options(api_key: str) -> dict:
+    """Connection settings shared by the sync and async clients."""
+    import httpx  # deferred so --help and arg errors don't pay for it
+
+    # HTTP/2 with a keep-alive pool, so every search made through a client
+    # reuses one TLS connection instead of handshaking again
+    return dict(
+        http2=True,
+        timeout=30.0,
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        },
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=30.0),
+    )
+
+
 class TavilyClient:
     """Client for interacting with Tavily Search API."""
 
     BASE_URL = "https://api.tavily.com"
 
     def __init__(self, api_key: str):
+        import httpx
+
         self.api_key = api_key
-        self.client = httpx.Client(timeout=30.0)
+        self.client = httpx.Client(**_client_options(api_key))
+
+    def close(self) -> None:
+        """Close the underlying connection pool."""
+        self.client.close()
+
+    def __enter__(self) -> "TavilyClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
-    def search(self, request: SearchRequest) -> SearchResponse:
+    def search(self, request: "BaseModel") -> SearchResponse:
         """Execute search request."""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        data = request.model_dump(exclude_unset=True)
+        # pydantic-core emits the JSON bytes directly, skipping the dict + json.dumps hop
+        body = request.model_dump_json(exclude_unset=True, exclude_none=True)
 
-        response = self.client.post(f"{self.BASE_URL}/search", headers=headers, json=data)
+        response = self.client.post(f"{self.BASE_URL}/search", content=body)
         response.raise_for_status()
 
-        return SearchResponse(**response.json())
+        return _RESPONSE_DECODER.decode(response.content)
+
+
+class AsyncTavilyClient:
+    """Runs many searches concurrently, multiplexed over one HTTP/2 connection."""
+
+    BASE_URL = TavilyClient.BASE_URL
+
+    def __init__(self, api_key: str, concurrency: int = BATCH_CONCURRENCY):
+        import asyncio
+        import httpx
+
+        self.client = httpx.AsyncClient(**_client_options(api_key))
+        self._slots = asyncio.Semaphore(concurrency)
+
+    async def __aenter__(self) -> "AsyncTavilyClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.client.aclose()
+
+    async def search(self, request: "BaseModel") -> SearchResponse:
+        """Execute one search request, waiting for a free slot first."""
+        body = request.model_dump_json(exclude_unset=True, exclude_none=True)
+
+        async with self._slots:
+            response = await self.client.post(f"{self.BASE_URL}/search", content=body)
+        response.raise_for_status()
+
+        return _RESPONSE_DECODER.decode(response.content)
+
+    async def search_many(self, requests: List["BaseModel"]) -> List[SearchResponse]:
+        """Execute every request concurrently; responses come back in request order."""
+        import asyncio
+
+        # gather re-raises the first failure as-is, so the CLI reports the HTTP error itself
+        return list(await asyncio.gather(*(self.search(request) for request in requests)))
+
+
+@lru_cache(maxsize=None)
+def _dotenv_api_key() -> Optional[str]:
+    """Read TAVILY_API_KEY from the project's .env file, once per process."""
+    return load_env_value(_PROJECT_DIR, "TAVILY_API_KEY")
+
+
+def search_batch(api_key: str, requests: List["BaseModel"]) -> List[SearchResponse]:
+    """Run every request concurrently over one async client."""
+    import asyncio
+
+    async def _run():
+        async with AsyncTavilyClient(api_key) as client:
+            return await client.search_many(requests)
+    return asyncio.run(_run())
+
+
+def read_queries(path: Path) -> List[str]:
+    """Read one query per line, ignoring blank lines."""
+    return [line.strip() for line in path.read_text().splitlines() if line.strip()]
 
 
 def get_api_key(api_key: Optional[str] = None) -> str:
-    """Get API key from parameter or environment."""
+    """Get API key from parameter, environment, or the project's .env file."""
     if api_key:
         return api_key
-    env_key = os.getenv("TAVILY_API_KEY")
+    env_key = os.getenv("TAVILY_API_KEY") or _dotenv_api_key()
     if not env_key:
         raise ValueError("API key must be provided via --api-key or TAVILY_API_KEY environment variable")
     return env_key
 
 
-def display_json(response: SearchResponse):
-    """Display response as JSON."""
-    console.print_json(json.dumps(response.model_dump(), indent=2))
+def display_json(response: SearchResponse, compact: bool = False):
+    """Display response as JSON.
+
+    With compact, piped output is a single line, so batches form NDJSON.
+    """
+    data = msgspec.json.encode(response)
+    if not console.is_terminal:
+        # Piped (e.g. into jq): skip Rich's re-parse and Pygments highlighting and
+        # hand the encoded bytes straight to the binary buffer. Flush first so
+        # anything Rich already wrote stays ahead of it.
+        if not compact:
+            data = msgspec.json.format(data, indent=2)
+        sys.stdout.flush()
+        sys.stdout.buffer.write(data + b"\n")
+        sys.stdout.buffer.flush()
+        return
+    console.print_json(data.decode())
+
+
+def _preview(text: str) -> str:
+    """Truncate result content to CONTENT_PREVIEW_CHARS for terminal display."""
+    if len(text) <= CONTENT_PREVIEW_CHARS:
+        return text
+    return text[:CONTENT_PREVIEW_CHARS].rstrip() + "…"
 
 
 def display_table(response: SearchResponse):
     """Display response as a table."""
+    from rich.panel import Panel
+    from rich.text import Text
+
+    # One print for the whole listing; soft_wrap leaves long lines to the
+    # terminal instead of having Rich measure and wrap every one
+    lines = []
     for i, result in enumerate(response.results, 1):
-        console.print(f"\n[bold]{i}. {result.title}[/bold] (Score: {result.score:.4f})")
-        console.print(f"   [blue]{result.url}[/blue]")
-        console.print(f"   [dim]{result.content}[/dim]")
+        lines.append(f"\n[bold]{i}. {result.title}[/bold] (Score: {result.score:.4f})")
+        lines.append(f"   [blue]{result.url}[/blue]")
+        lines.append(f"   [dim]{_preview(result.content)}[/dim]")
+    if lines:
+        console.print("\n".join(lines), soft_wrap=True)
 
     if response.answer:
         console.print(Panel.fit(Text(response.answer, style="green"), title="Answer"))
@@ -124,12 +261,22 @@ def display_table(response: SearchResponse):
 
 def display_tree(response: SearchResponse):
     """Display response as a tree."""
-    tree = Tree(f"[bold cyan]Search Results for: {response.query}[/bold cyan]")
+    from rich.panel import Panel
+    from rich.text import Text
+    from rich.tree import Tree
+
+    tree = Tree(Text(f"Search Results for: {response.query}", style="bold cyan"))
 
+    # One node per result, assembled from styled spans: no markup to parse and
+    # nothing in a title or page snippet can be mistaken for a style tag
     for i, result in enumerate(response.results, 1):
-        branch = tree.add(f"[bold]{i}. {result.title}[/bold] (Score: {result.score:.4f})")
-        branch.add(f"[blue]{result.url}[/blue]")
-        branch.add(f"[green]{result.content}[/green]")
+        tree.add(Text.assemble(
+            (f"{i}. {result.title}", "bold"),
+            f" (Score: {result.score:.4f})\n",
+            (result.url, "blue"),
+            "\n",
+            (result.content, "green"),
+        ))
 
     console.print(tree)
 
@@ -137,12 +284,25 @@ def display_tree(response: SearchResponse):
         console.print(Panel.fit(Text(response.answer, style="yellow"), title="Answer"))
 
 
+def display_response(response: SearchResponse, format: str):
+    """Display response in the requested output format."""
+    if format == "json":
+        display_json(response)
+    elif format == "table":
+        display_table(response)
+    elif format == "tree":
+        display_tree(response)
+    else:
+        console.print(f"[red]Unknown format: {format}[/red]")
+
+
 @app.command()
 def search(
     query: Optional[str] = typer.Argument(None, help="The search query"),
     api_key: Optional[str] = typer.Option(None, "--api-key", help="Tavily API key"),
     format: str = typer.Option("table", "--format", help="Output format: json, table, tree"),
     use_env: bool = typer.Option(False, "--use-env", help="Use SEARCH_QUERY environment variable as query"),
+    queries_file: Optional[Path] = typer.Option(None, "--queries-file", help="File with one query per line, searched concurrently"),
     auto_parameters: bool = typer.Option(False, "--auto-parameters", help="Auto-configure parameters"),
     topic: str = typer.Option("general", "--topic", help="Search topic: general, news, finance"),
     search_depth: str = typer.Option("basic", "--search-depth", help="Search depth: basic, advanced"),
@@ -166,32 +326,6 @@ def search(
 
     Example: tavilySearch "who is Leo Messi" --limit 10 --format json
     """
-    # Auto-load environment variables from project .env file if API key not set
-    if not os.getenv("TAVILY_API_KEY"):
-        # Get the project directory (where main.py is located)
-        project_dir = Path(__file__).parent
-        original_cwd = os.getcwd()
-        
-        try:
-            # Change to project directory to load .env file
-            os.chdir(project_dir)
-            # Use zsh to source the autoload script and print the key
-            import subprocess
-            # We need to unset TAVILY_API_KEY first in the subshell to ensure loadenv actually loads it
-            # and we redirect stderr to /dev/null to avoid capturing the "loaded ..." messages
-            result = subprocess.run(
-                ["zsh", "-c", "unset TAVILY_API_KEY; source $HOME/DEV/bin/autoload_environment.zsh; loadenv_verbose_masked .env >/dev/null 2>&1; echo $TAVILY_API_KEY"],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                # The stdout might still contain some noise if not perfectly silenced, so we take the last line
-                output_lines = result.stdout.strip().split('\n')
-                os.environ["TAVILY_API_KEY"] = output_lines[-1].strip()
-        finally:
-            # Always change back to the original directory
-            os.chdir(original_cwd)
-    
     try:
         if use_env:
             env_query = os.getenv("SEARCH_QUERY")
@@ -200,27 +334,18 @@ def search(
             else:
                 console.print("[red]--use-env specified but SEARCH_QUERY environment variable not found.[/red]")
                 raise typer.Exit(1)
-        if not query:
+        queries = read_queries(queries_file) if queries_file else [query] if query else []
+        if not queries:
             console.print("[red]Query not provided.[/red]")
             raise typer.Exit(1)
 
         key = get_api_key(api_key)
 
-        # Parse include_answer and include_raw_content
-        inc_answer = include_answer.lower() if include_answer else False
-        if inc_answer in ("true", "basic", "advanced"):
-            inc_answer = inc_answer if inc_answer != "true" else True
-        else:
-            inc_answer = False
-
-        inc_raw = include_raw_content.lower() if include_raw_content else False
-        if inc_raw in ("true", "markdown", "text"):
-            inc_raw = inc_raw if inc_raw != "true" else True
-        else:
-            inc_raw = False
+        inc_answer = _ANSWER_MODES.get(include_answer.lower() if include_answer else None, False)
+        inc_raw = _RAW_CONTENT_MODES.get(include_raw_content.lower() if include_raw_content else None, False)
 
-        request = SearchRequest(
-            query=query,
+        request_model = _search_request_model()
+        options = dict(
             auto_parameters=auto_parameters,
             topic=topic,
             search_depth=search_depth,
@@ -239,18 +364,22 @@ def search(
             country=country,
             include_credits=include_credits,
         )
+        requests = [request_model(query=q, **options) for q in queries]
 
-        client = TavilyClient(key)
-        response = client.search(request)
-
-        if format == "json":
-            display_json(response)
-        elif format == "table":
-            display_table(response)
-        elif format == "tree":
-            display_tree(response)
+        if len(requests) == 1:
+            with TavilyClient(key) as client:
+                display_response(client.search(requests[0]), format)
         else:
-            console.print(f"[red]Unknown format: {format}[/red]")
+            responses = search_batch(key, requests)
+            if format == "json" and not console.is_terminal:
+                # Piped JSON batches are NDJSON, one response per line with no
+                # rules in between; each document carries its own "query"
+                for response in responses:
+                    display_json(response, compact=True)
+            else:
+                for request, response in zip(requests, responses):
+                    console.rule(request.query)
+                    display_response(response, format)
 
     except Exception as e:
         console.print(f"[red]Error: {e}[/red]")
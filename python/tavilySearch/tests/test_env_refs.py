@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Tests for env_refs, the .env resolver shared with the kagi CLI."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from env_refs import DEFER_PARENT_MAX_DEPTH, load_env_value, resolve_env_value
+
+KEY = "TAVILY_API_KEY"
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv("HOME", str(home))
+    return home
+
+
+def write_env(directory: Path, text: str) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / ".env").write_text(text)
+
+
+class TestPlainValues:
+    def test_empty_is_none(self, home):
+        assert resolve_env_value(KEY, "", home) is None
+        assert resolve_env_value(KEY, None, home) is None
+
+    def test_plain_value_passes_through(self, home):
+        assert resolve_env_value(KEY, "tvly-123", home) == "tvly-123"
+
+    def test_backslash_escapes_special_values(self, home):
+        assert resolve_env_value(KEY, "\\DEFER_PARENT", home) == "DEFER_PARENT"
+
+
+class TestRef:
+    def test_reads_key_from_referenced_file(self, home):
+        write_env(home / "dev", 'SHARED="tvly-ref"\n')
+        assert resolve_env_value(KEY, f"REF:{home}/dev/.env:SHARED", home) == "tvly-ref"
+
+    def test_rejects_paths_outside_home(self, home, tmp_path):
+        write_env(tmp_path / "elsewhere", "SHARED=x\n")
+        with pytest.raises(ValueError, match="invalid REF path"):
+            resolve_env_value(KEY, f"REF:{tmp_path}/elsewhere/.env:SHARED", home)
+
+    def test_rejects_relative_paths(self, home):
+        with pytest.raises(ValueError, match="invalid REF path"):
+            resolve_env_value(KEY, "REF:dev/.env:SHARED", home)
+
+    def test_missing_file(self, home):
+        with pytest.raises(ValueError, match="not found"):
+            resolve_env_value(KEY, f"REF:{home}/nope/.env:SHARED", home)
+
+    def test_missing_key(self, home):
+        write_env(home / "dev", "OTHER=1\n")
+        with pytest.raises(ValueError, match="key SHARED not found"):
+            resolve_env_value(KEY, f"REF:{home}/dev/.env:SHARED", home)
+
+
+class TestDeferParent:
+    def test_nearest_parent_wins(self, home):
+        write_env(home / "dev", f"{KEY}=far\n")
+        write_env(home / "dev" / "bin", f"{KEY}=near\n")
+        project = home / "dev" / "bin" / "python" / "tavilySearch"
+        project.mkdir(parents=True)
+        assert resolve_env_value(KEY, "DEFER_PARENT", project) == "near"
+
+    def test_parent_without_key_is_skipped(self, home):
+        write_env(home / "dev", f"{KEY}=far\n")
+        write_env(home / "dev" / "bin", "OTHER=1\n")
+        project = home / "dev" / "bin" / "tavilySearch"
+        project.mkdir(parents=True)
+        assert resolve_env_value(KEY, "DEFER_PARENT", project) == "far"
+
+    def test_parent_value_is_resolved_in_turn(self, home):
+        write_env(home / "dev", f"{KEY}=root\n")
+        write_env(home / "dev" / "bin", f"{KEY}=DEFER_PARENT\n")
+        project = home / "dev" / "bin" / "tavilySearch"
+        project.mkdir(parents=True)
+        assert resolve_env_value(KEY, "DEFER_PARENT", project) == "root"
+
+    def test_home_env_is_read_but_search_stops_there(self, home, tmp_path):
+        write_env(tmp_path, f"{KEY}=above-home\n")
+        project = home / "tavilySearch"
+        project.mkdir()
+        with pytest.raises(ValueError, match="DEFER_PARENT"):
+            resolve_env_value(KEY, "DEFER_PARENT", project)
+        write_env(home, f"{KEY}=home\n")
+        assert resolve_env_value(KEY, "DEFER_PARENT", project) == "home"
+
+    def test_depth_limit(self, home):
+        write_env(home / "a", f"{KEY}=v\n")
+        at_limit = home / "a" / Path(*["d"] * DEFER_PARENT_MAX_DEPTH)
+        at_limit.mkdir(parents=True)
+        assert resolve_env_value(KEY, "DEFER_PARENT", at_limit) == "v"
+        too_deep = at_limit / "d"
+        too_deep.mkdir()
+        with pytest.raises(ValueError, match="DEFER_PARENT"):
+            resolve_env_value(KEY, "DEFER_PARENT", too_deep)
+
+
+class TestCommand:
+    def test_output_replaces_value(self, home):
+        assert resolve_env_value(KEY, "${printf 'tvly-cmd\\n'}", home) == "tvly-cmd"
+
+    def test_runs_in_env_dir(self, home):
+        assert resolve_env_value(KEY, "${pwd}", home) == str(home)
+
+    def test_failure_raises(self, home):
+        with pytest.raises(ValueError, match="command failed"):
+            resolve_env_value(KEY, "${exit 3}", home)
+
+
+class TestLoadEnvValue:
+    def test_reads_and_resolves(self, home):
+        write_env(home / "dev", f"{KEY}=parent\n")
+        write_env(home / "dev" / "tavilySearch", f"{KEY}=DEFER_PARENT\n")
+        assert load_env_value(home / "dev" / "tavilySearch", KEY) == "parent"
+
+    def test_missing_key_is_none(self, home):
+        write_env(home / "project", "OTHER=1\n")
+        assert load_env_value(home / "project", KEY) is None
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Tests for the Tavily search CLI."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import main
+
+# Trimmed from a recorded /search response; Tavily sometimes sends numerics as strings
+RECORDED_RESPONSE = b"""{
+  "query": "who is Leo Messi?",
+  "answer": null,
+  "images": [],
+  "results": [
+    {
+      "title": "Lionel Messi Facts | Britannica",
+      "url": "https://www.britannica.com/facts/Lionel-Messi",
+      "content": "Lionel Messi, an Argentine footballer, is widely regarded as one of the greatest football players of his generation.",
+      "score": "0.81025416",
+      "raw_content": null
+    },
+    {
+      "title": "Lionel Messi - Wikipedia",
+      "url": "https://en.wikipedia.org/wiki/Lionel_Messi",
+      "content": "Lionel Andres Messi is an Argentine professional footballer.",
+      "score": 1,
+      "raw_content": null
+    }
+  ],
+  "response_time": "1.67",
+  "request_id": "123e4567-e89b-12d3-a456-426614174111"
+}"""
+
+
+class TestResponseDecoding:
+    def test_string_and_int_numerics_are_coerced(self):
+        response = main._RESPONSE_DECODER.decode(RECORDED_RESPONSE)
+        assert response.response_time == 1.67
+        assert [r.score for r in response.results] == [0.81025416, 1.0]
+        assert all(isinstance(r.score, float) for r in response.results)
+        assert response.request_id == "123e4567-e89b-12d3-a456-426614174111"
+
+
+class TestDisplayJson:
+    def test_piped_output_keeps_null_and_empty_fields(self, capsysbinary):
+        response = main._RESPONSE_DECODER.decode(RECORDED_RESPONSE)
+        main.display_json(response)
+        document = json.loads(capsysbinary.readouterr().out)
+        assert document["answer"] is None
+        assert document["images"] == []
+        assert document["usage"] is None
+        assert document["results"][0]["raw_content"] is None
+        assert document["results"][0]["favicon"] is None